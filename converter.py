@@ -17,6 +17,10 @@ Telegram频道: https://t.me/webjsp
 
 import os
 import sys
+import time
+import errno
+import io
+import mmap
 import zipfile
 import shutil
 import subprocess
@@ -26,9 +30,591 @@ import string
 import json
 import struct
 import re
+import asyncio
+import locale
+import threading
+import weakref
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager, asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# aapt2 dump badging 中的包名、版本号、版本名（一次扫描同时匹配）
+_BADGING_RE = re.compile(
+    r"package: name='(?P<pkg>[^']+)'|versionCode='(?P<vc>\d+)'|versionName='(?P<vn>[^']+)'"
+)
+
+# 拆分包内APK分类用的名称特征（均为小写）
+_UNIVERSAL_APK_MARKERS = ('universal', 'standalone')
+_SPLIT_APK_MARKERS = ('config.', 'split_config', 'split_')
+_MANIFEST_NAMES = frozenset({'manifest.json', 'info.json'})
+
+# base模块中路径不变、直接复制的目录
+_PASSTHROUGH_DIRS = frozenset({'res', 'lib', 'assets'})
+
+# Bundle保留的文件/目录名（不能在root目录中使用，均为小写）
+_RESERVED_NAMES = frozenset({
+    'resources.arsc', 'resources.pb', 'manifest',
+    'dex', 'res', 'lib', 'assets', 'root'
+})
+
+# 批量并发时限制同时运行的bundletool JVM数量（由进程池初始化函数设置）
+_jvm_semaphore = None
+
+# 生成的中间zip统一使用的条目时间戳（zip格式支持的最早时间），同样的输入得到逐字节相同的输出
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# 短时运行的Java工具（keytool/jarsigner/apksigner）的JVM启动参数：只用C1编译、串行GC、
+# 类数据共享，运行时间主要是JVM启动的场景下可明显缩短每次调用的耗时
+_JVM_QUICK_FLAGS = ("-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC", "-Xshare:auto")
+
+# Android对齐extra字段的header ID（apksigner/zipalign使用的填充格式）
+_ALIGNMENT_EXTRA_ID = 0xD935
+# 原始条目复制直接操作的ZipFile内部属性
+_ZIP_RAW_COPY_ATTRS = ('fp', '_writecheck', '_didModify', 'start_dir', 'NameToInfo', 'filelist')
+
+# 输出文件路径 -> 锁（见_output_lock），没有转换在使用时自动移除
+_output_locks = weakref.WeakValueDictionary()
+_output_locks_guard = threading.Lock()
+
+# 内存盘临时目录 -> 正在进行的转换预留的字节数（见_pick_temp_dir）
+_temp_reserved = {}
+_temp_reserved_lock = threading.Lock()
+
+# keystore信息缓存: keystore目录 -> (目录mtime, {文件名(不含扩展名): keystore信息})
+_keystore_cache = {}
+
+# keystore缓存中"任意可用keystore"的键
+_ANY_KEYSTORE = "_any_"
+
+# 签名信息（密码、别名、DN）使用的随机数源，取自系统熵源
+_rng = random.SystemRandom()
+
+
+def _init_batch_worker(jvm_semaphore):
+    """进程池工作进程初始化：保存共享的JVM信号量"""
+    global _jvm_semaphore
+    _jvm_semaphore = jvm_semaphore
+
+
+class _MappedFile(io.RawIOBase):
+    """
+    把只读mmap包装成文件对象（zipfile需要seekable()等标准文件接口，mmap本身没有）
+    
+    指定start/length时只暴露其中一段（如外层归档中未压缩存储的内层APK），
+    位置独立维护，同一mmap上的多个包装对象互不影响
+    """
+    
+    def __init__(self, mapped, start=0, length=None):
+        self._mapped = mapped
+        self._start = start
+        self._end = len(mapped) if length is None else start + length
+        self._pos = start
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def read(self, size=-1):
+        end = self._end if size is None or size < 0 else min(self._pos + size, self._end)
+        if end <= self._pos:
+            return b''
+        data = self._mapped[self._pos:end]
+        self._pos = end
+        return data
+    
+    def readinto(self, buffer):
+        n = min(len(buffer), self._end - self._pos)
+        if n <= 0:
+            return 0
+        # 通过memoryview直接从映射复制到目标缓冲区，不产生中间bytes对象
+        with memoryview(self._mapped) as view:
+            buffer[:n] = view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+    
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            new_pos = self._start + pos
+        elif whence == io.SEEK_CUR:
+            new_pos = self._pos + pos
+        elif whence == io.SEEK_END:
+            new_pos = self._end + pos
+        else:
+            raise ValueError(f"无效的whence: {whence}")
+        if new_pos < self._start:
+            raise ValueError("seek位置不能为负")
+        self._pos = new_pos
+        return new_pos - self._start
+    
+    def tell(self):
+        return self._pos - self._start
+
+
+def _scan_dir(directory, suffixes):
+    """
+    列出目录下扩展名（不区分大小写）在suffixes中的文件
+    
+    使用os.scandir一次遍历，DirEntry自带文件类型信息，无需逐个stat；目录不存在时返回空列表
+    """
+    try:
+        with os.scandir(directory) as it:
+            return [
+                Path(entry.path) for entry in it
+                if os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _count_dir(directory, suffixes):
+    """统计目录下扩展名在suffixes中的文件数量（逐个遍历DirEntry，不创建Path对象）"""
+    try:
+        with os.scandir(directory) as it:
+            return sum(
+                1 for entry in it
+                if os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file()
+            )
+    except FileNotFoundError:
+        return 0
+
+
+def json_loads(data):
+    """解析JSON字节串（安装了orjson时直接从bytes解析，速度更快；否则使用标准库json）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_keystores(keystore_dir):
+    """
+    读取keystore目录下所有JSON，返回 {文件名(不含扩展名): keystore信息}
+    
+    结果按目录缓存、各转换器实例共用，以目录的修改时间作为缓存版本，
+    新增或删除keystore后自动重新加载；_ANY_KEYSTORE键对应第一个keystore文件存在的条目
+    """
+    try:
+        mtime = keystore_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    
+    cached = _keystore_cache.get(str(keystore_dir))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    keystores = {}
+    for json_file in _scan_dir(keystore_dir, {'.json'}):
+        try:
+            with open(json_file, 'rb') as f:
+                info = json_loads(f.read())
+        except (OSError, ValueError):
+            continue
+        keystores[json_file.stem] = info
+        
+        if _ANY_KEYSTORE not in keystores and Path(info.get("keystore_file", "")).exists():
+            keystores[_ANY_KEYSTORE] = info
+    
+    _keystore_cache[str(keystore_dir)] = (mtime, keystores)
+    return keystores
+
+
+def _move_file(src, dst):
+    """
+    将临时文件移动到输出路径（覆盖已存在的文件）
+    
+    同一设备上用os.replace直接重命名，不复制数据；跨设备时退回copyfile
+    （临时文件的元数据无需保留，copyfile可走sendfile/CopyFileEx等系统级快速复制）
+    """
+    try:
+        if os.stat(src).st_dev == os.stat(os.path.dirname(os.path.abspath(dst))).st_dev:
+            os.replace(src, dst)
+            return
+    except OSError:
+        pass
+    shutil.copyfile(str(src), str(dst))
+
+
+@contextmanager
+def _pick_temp_dir(required_bytes):
+    """
+    选择存放中间文件的临时目录（with语句内有效）
+    
+    内存盘（环境变量RAMDISK_DIR指定的目录，或Linux的/dev/shm）剩余空间足够时使用内存盘，
+    中间文件的读写不再占用磁盘IO；否则得到None，使用系统默认临时目录。
+    选中内存盘时在with语句结束前预留required_bytes：同时进行的转换（异步批量、线程池）
+    扣除彼此的预留量后再判断剩余空间，不会都通过检查后一起把内存盘写满
+    """
+    candidates = []
+    if os.environ.get("RAMDISK_DIR"):
+        candidates.append(os.environ["RAMDISK_DIR"])
+    if sys.platform.startswith("linux"):
+        candidates.append("/dev/shm")
+    
+    chosen = None
+    with _temp_reserved_lock:
+        for candidate in candidates:
+            try:
+                if not (os.path.isdir(candidate) and os.access(candidate, os.W_OK)):
+                    continue
+                reserved = _temp_reserved.get(candidate, 0)
+                if shutil.disk_usage(candidate).free - reserved >= required_bytes:
+                    chosen = candidate
+                    _temp_reserved[candidate] = reserved + required_bytes
+                    break
+            except OSError:
+                continue
+    
+    try:
+        yield chosen
+    finally:
+        if chosen is not None:
+            with _temp_reserved_lock:
+                _temp_reserved[chosen] -= required_bytes
+
+
+def _entry_data_offset(fp, info):
+    """返回条目（压缩后）数据在zip文件fp中的起始偏移"""
+    # 本地文件头的文件名/extra长度可能与中央目录不同，需从本地文件头读取
+    fp.seek(info.header_offset)
+    header = fp.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"本地文件头损坏: {info.filename}")
+    fields = struct.unpack(zipfile.structFileHeader, header)
+    return (info.header_offset + zipfile.sizeFileHeader
+            + fields[zipfile._FH_FILENAME_LENGTH] + fields[zipfile._FH_EXTRA_FIELD_LENGTH])
+
+
+def _copy_bytes(src_fp, dst_fp, length, name, buf=None):
+    """从src_fp当前位置复制length字节到dst_fp（经由可复用缓冲区buf），数据不足时抛出BadZipFile"""
+    view = memoryview(buf if buf is not None else bytearray(1024 * 1024))
+    remaining = length
+    while remaining > 0:
+        n = src_fp.readinto(view[:min(remaining, len(view))])
+        if not n:
+            raise zipfile.BadZipFile(f"条目数据不完整: {name}")
+        dst_fp.write(view[:n])
+        remaining -= n
+
+
+def _open_inner_zip(archive, mapped, info):
+    """
+    打开外层归档（已mmap）中的内层APK，返回ZipFile；内层APK无效时返回None
+    
+    STORED存放的直接在映射上读取，压缩存放的解压到内存。
+    每次调用使用独立的文件对象，可在线程池中并行调用
+    """
+    try:
+        if info.compress_type == zipfile.ZIP_STORED:
+            offset = _entry_data_offset(_MappedFile(mapped), info)
+            return zipfile.ZipFile(_MappedFile(mapped, offset, info.compress_size), 'r')
+        with archive.open(info) as src:
+            return zipfile.ZipFile(io.BytesIO(src.read()), 'r')
+    except zipfile.BadZipFile:
+        return None
+
+
+def _zip_raw_copy_supported(zf):
+    """检查ZipFile是否具备原始条目复制所依赖的内部属性"""
+    return all(hasattr(zf, name) for name in _ZIP_RAW_COPY_ATTRS) \
+        and hasattr(zipfile.ZipInfo, 'FileHeader')
+
+
+def _copy_zip_entry_raw(src_zip, info, dst_zip, arcname, buf=None):
+    """
+    将src_zip中的条目以原始（压缩后的）数据复制到dst_zip，跳过解压和重新压缩
+    
+    CRC、大小和压缩方式沿用原条目；原条目的extra字段（如zipalign填充）和
+    数据描述符标志不保留，由新的本地文件头直接给出大小信息。
+    STORED条目在写入时即完成对齐（与zipalign -p 4相同：.so按4096字节，其余按4字节），
+    填充放在本地文件头的extra字段中。
+    buf为可复用的bytearray，逐条目复制时传入同一个缓冲区，避免每个数据块分配新的bytes
+    """
+    if info.flag_bits & 0x01:
+        raise zipfile.BadZipFile(f"不支持加密条目: {info.filename}")
+    
+    if not _zip_raw_copy_supported(dst_zip):
+        # 当前Python的ZipFile内部实现不同，退回公开接口：解压后按原压缩方式重新写入（不做对齐）
+        zinfo = zipfile.ZipInfo(arcname, date_time=info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        zinfo.file_size = info.file_size
+        with src_zip.open(info) as src, dst_zip.open(zinfo, 'w') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        return
+    
+    src_fp = src_zip.fp
+    src_fp.seek(_entry_data_offset(src_fp, info))
+    
+    zinfo = zipfile.ZipInfo(arcname, date_time=info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.flag_bits = info.flag_bits & ~0x08
+    zinfo.external_attr = info.external_attr
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    
+    dst_zip._writecheck(zinfo)
+    dst_zip._didModify = True
+    dst_fp = dst_zip.fp
+    zinfo.header_offset = dst_fp.tell()
+    
+    if zinfo.compress_type == zipfile.ZIP_STORED:
+        alignment = 4096 if arcname.endswith('.so') else 4
+        header_len = len(zinfo.FileHeader())
+        padding = -(zinfo.header_offset + header_len) % alignment
+        if padding:
+            # 使用Android的对齐extra字段（0xD935，与apksigner相同），至少需要6字节
+            while padding < 6:
+                padding += alignment
+            zinfo.extra = struct.pack('<HHH', _ALIGNMENT_EXTRA_ID, padding - 4, alignment) \
+                + b'\0' * (padding - 6)
+        dst_fp.write(zinfo.FileHeader())
+        # 填充只需要出现在本地文件头中，中央目录不保留
+        zinfo.extra = b''
+    else:
+        dst_fp.write(zinfo.FileHeader())
+    
+    _copy_bytes(src_fp, dst_fp, info.compress_size, info.filename, buf)
+    
+    dst_zip.filelist.append(zinfo)
+    dst_zip.NameToInfo[arcname] = zinfo
+    dst_zip.start_dir = dst_fp.tell()
+
+
+@contextmanager
+def _output_lock(output_path):
+    """
+    进程内按输出文件加锁：输出到同一文件的转换（如 foo.apks 和 foo.xapk 都生成 foo.apk）依次进行，
+    避免一个转换删除/移动输出文件时另一个正在写入
+    """
+    key = os.path.normcase(os.path.abspath(output_path))
+    with _output_locks_guard:
+        lock = _output_locks.get(key)
+        if lock is None:
+            lock = _output_locks[key] = threading.Lock()
+    with lock:
+        yield
+
+
+@contextmanager
+def _file_lock(lock_path, timeout=300):
+    """
+    跨进程文件锁（Windows使用msvcrt，其他平台使用fcntl）
+    
+    Windows下等待超过timeout秒仍未拿到锁时抛出TimeoutError
+    """
+    with open(lock_path, 'a+b') as fh:
+        if os.name == 'nt':
+            import msvcrt
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK重试10秒后仍被占用会抛出EDEADLK/EACCES，未超时则继续等待；其他错误直接抛出
+                    if e.errno not in (errno.EDEADLK, errno.EACCES):
+                        raise
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"等待文件锁超时: {lock_path}") from e
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _jvm_slot():
+    """获取一个JVM运行名额（非批量模式下不做限制）"""
+    if _jvm_semaphore is None:
+        yield
+        return
+    with _jvm_semaphore:
+        yield
+
+
+@asynccontextmanager
+async def _jvm_slot_async(semaphore=None):
+    """
+    _jvm_slot 的异步版本，semaphore默认使用批量模式的_jvm_semaphore
+    
+    阻塞的acquire放到线程池中等待，不会卡住事件循环中的其他转换；
+    等待期间被取消时，名额拿到后立即归还
+    """
+    semaphore = semaphore or _jvm_semaphore
+    if semaphore is None:
+        yield
+        return
+    
+    acquired = asyncio.get_running_loop().run_in_executor(None, semaphore.acquire)
+    try:
+        await asyncio.shield(acquired)
+    except asyncio.CancelledError:
+        acquired.add_done_callback(lambda _: semaphore.release())
+        raise
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+def _bundletool_archive(config):
+    """bundletool的AppCDS归档路径，归档不存在或比bundletool.jar旧时返回None"""
+    archive = config.tools_dir / "bundletool.jsa"
+    try:
+        if archive.stat().st_mtime_ns >= config.bundletool.stat().st_mtime_ns:
+            return archive
+    except OSError:
+        pass
+    return None
+
+
+def _bundletool_cmd(config):
+    """java -jar bundletool.jar 命令前缀（有AppCDS归档时加载归档，省去每次启动时的类加载和校验）"""
+    cmd = [str(config.java)]
+    archive = _bundletool_archive(config)
+    if archive:
+        cmd.append(f"-XX:SharedArchiveFile={archive}")
+    cmd += ["-jar", str(config.bundletool)]
+    return cmd
+
+
+def prepare_bundletool_archive(config):
+    """
+    生成bundletool的AppCDS归档（tools/bundletool.jsa），已是最新时直接返回
+    
+    运行一次 bundletool version 并用-XX:ArchiveClassesAtExit导出已加载的类，
+    之后每次启动bundletool都从归档映射这些类。先写入临时文件再重命名，
+    同时运行的bundletool不会读到写了一半的归档；生成失败不影响转换。
+    """
+    if _bundletool_archive(config):
+        return
+    
+    archive = config.tools_dir / "bundletool.jsa"
+    temp = archive.with_name(f"bundletool.{os.getpid()}.jsa")
+    try:
+        subprocess.run(
+            [str(config.java), f"-XX:ArchiveClassesAtExit={temp}", "-jar", str(config.bundletool), "version"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=120
+        )
+        if temp.exists():
+            os.replace(temp, archive)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+
+
+def warm_bundletool(config):
+    """
+    预热bundletool：生成AppCDS归档并运行一次 bundletool version，
+    让JVM和jar文件进入系统缓存，第一次转换时不必冷启动；失败时忽略
+    """
+    prepare_bundletool_archive(config)
+    try:
+        subprocess.run(
+            _bundletool_cmd(config) + ["version"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+# 正在运行的外部工具进程（subprocess.Popen或asyncio的Process），停止转换时由terminate_running_tools结束
+_running_tools = set()
+_running_tools_lock = threading.Lock()
+
+
+def terminate_running_tools():
+    """
+    结束当前进程启动的所有正在运行的外部工具（bundletool/jarsigner/aapt2等）
+    
+    被结束的工具返回非0，对应的转换按失败处理（不完整的输出文件会被删除）。
+    可在任意线程中调用，返回结束的进程数。
+    """
+    with _running_tools_lock:
+        procs = list(_running_tools)
+    for proc in procs:
+        try:
+            proc.terminate()
+        except (ProcessLookupError, OSError):
+            pass
+    return len(procs)
+
+
+@contextmanager
+def _tracked_tool(proc):
+    """在with语句内把外部工具进程登记到_running_tools，停止转换时可由terminate_running_tools结束"""
+    with _running_tools_lock:
+        _running_tools.add(proc)
+    try:
+        yield proc
+    finally:
+        with _running_tools_lock:
+            _running_tools.discard(proc)
+
+
+def _run_tool(cmd, tail=200):
+    """
+    运行外部工具，返回 (返回码, 输出末尾)
+    
+    stdout与stderr合并后逐行读取，只保留最后tail行（出错时打印用），
+    bundletool等工具输出再多也不会整块缓存在内存中
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors='replace'
+    )
+    with _tracked_tool(proc):
+        tail_buf = deque(maxlen=tail)
+        with proc.stdout:
+            for line in proc.stdout:
+                tail_buf.append(line)
+        return proc.wait(), ''.join(tail_buf)
+
+
+async def _run_tool_async(cmd, tail=200):
+    """异步运行外部工具（不阻塞事件循环），返回 (返回码, 输出末尾)"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    with _tracked_tool(proc):
+        encoding = locale.getpreferredencoding(False)
+        tail_buf = deque(maxlen=tail)
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            tail_buf.append(line.decode(encoding, errors='replace'))
+        return await proc.wait(), ''.join(tail_buf)
+
 
 class Config:
     """配置类"""
@@ -39,6 +625,10 @@ class Config:
         self.apks_dir = self.base_dir / "apks"
         self.apk2_dir = self.base_dir / "apk2"  # APKS/XAPK/APKM转换输出目录
         self.split_apk_dir = self.base_dir / "split_apk"  # 放置待转换的APKS/XAPK/APKM文件
+        # 输出目录的字符串形式（界面中作为默认值反复使用）
+        self.aab_dir_s = str(self.aab_dir)
+        self.apks_dir_s = str(self.apks_dir)
+        self.apk2_dir_s = str(self.apk2_dir)
         self.keystore_dir = self.base_dir / "keystore"
         self.tools_dir = self.base_dir / "tools"
         
@@ -51,8 +641,14 @@ class Config:
         self.jarsigner = self.java_home / "bin" / "jarsigner.exe"
         self.zipalign = self.tools_dir / "android-sdk" / "build-tools" / "35.0.0" / "zipalign.exe"
         
+        # 工具检测通过后缓存结果，重复调用validate不再逐个stat
+        self._validated = False
+        
     def validate(self):
-        """验证必要的工具是否存在"""
+        """验证必要的工具是否存在（检测通过后缓存结果，缺少工具时每次重新检测）"""
+        if self._validated:
+            return True
+        
         tools = {
             "bundletool.jar": self.bundletool,
             "aapt2.exe": self.aapt2,
@@ -73,74 +669,82 @@ class Config:
             return False
         
         print("[OK] 所有工具检测通过")
+        self._validated = True
         return True
+    
+    def get_keystore(self):
+        """返回keystore目录中第一个可用的keystore信息（按目录修改时间缓存），没有则返回None"""
+        return _load_keystores(self.keystore_dir).get(_ANY_KEYSTORE)
 
 
 class RandomSignatureGenerator:
     """随机签名生成器 - 符合Google Play要求"""
     
+    # 批量转换共用的keystore文件名（不含扩展名）
+    SHARED_KEYSTORE_NAME = "_shared"
+    
     # 常见的英文名字
-    FIRST_NAMES = [
+    FIRST_NAMES = (
         "James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph",
         "Thomas", "Charles", "Christopher", "Daniel", "Matthew", "Anthony", "Mark",
         "Emma", "Olivia", "Ava", "Isabella", "Sophia", "Mia", "Charlotte", "Amelia"
-    ]
+    )
     
-    LAST_NAMES = [
+    LAST_NAMES = (
         "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
         "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
         "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White"
-    ]
+    )
     
     # 公司后缀
-    COMPANY_SUFFIXES = ["Inc", "LLC", "Corp", "Ltd", "Co", "Technologies", "Software", "Apps", "Mobile", "Digital"]
+    COMPANY_SUFFIXES = ("Inc", "LLC", "Corp", "Ltd", "Co", "Technologies", "Software", "Apps", "Mobile", "Digital")
     
     # 部门名称
-    DEPARTMENTS = ["Development", "Engineering", "Mobile", "Android", "Software", "Technology", "Digital", "Apps"]
+    DEPARTMENTS = ("Development", "Engineering", "Mobile", "Android", "Software", "Technology", "Digital", "Apps")
     
     # 城市
-    CITIES = [
+    CITIES = (
         "San Francisco", "New York", "Los Angeles", "Seattle", "Austin", "Boston", 
         "Chicago", "Denver", "Portland", "San Diego", "Atlanta", "Miami",
         "London", "Berlin", "Tokyo", "Singapore", "Sydney", "Toronto"
-    ]
+    )
     
     # 州/省
-    STATES = [
+    STATES = (
         "California", "New York", "Texas", "Washington", "Massachusetts", "Colorado",
         "Oregon", "Florida", "Georgia", "Illinois", "Virginia", "Arizona"
-    ]
+    )
     
     # 国家代码
-    COUNTRIES = ["US", "GB", "DE", "JP", "SG", "AU", "CA", "FR", "NL", "SE"]
+    COUNTRIES = ("US", "GB", "DE", "JP", "SG", "AU", "CA", "FR", "NL", "SE")
     
     @classmethod
     def generate_password(cls, length=16):
         """生成安全密码（避免使用可能导致命令行问题的特殊字符）"""
         # 只使用字母和数字，避免特殊字符在命令行中的问题
         chars = string.ascii_letters + string.digits
-        password = ''.join(random.choice(chars) for _ in range(length))
+        password = ''.join(_rng.choices(chars, k=length))
         return password
     
     @classmethod
     def generate_alias(cls):
         """生成密钥别名"""
-        return f"key_{random.randint(10000, 99999)}"
+        return f"key_{_rng.randint(10000, 99999)}"
     
     @classmethod
     def generate_dname(cls):
         """生成随机的Distinguished Name（符合Google要求）"""
         # 生成公司名
-        first = random.choice(cls.FIRST_NAMES)
-        last = random.choice(cls.LAST_NAMES)
-        suffix = random.choice(cls.COMPANY_SUFFIXES)
+        first = _rng.choice(cls.FIRST_NAMES)
+        last = _rng.choice(cls.LAST_NAMES)
+        suffix = _rng.choice(cls.COMPANY_SUFFIXES)
         
         cn = f"{first} {last}"  # Common Name - 开发者名称
-        ou = random.choice(cls.DEPARTMENTS)  # Organizational Unit - 部门
+        ou = _rng.choice(cls.DEPARTMENTS)  # Organizational Unit - 部门
         o = f"{last} {suffix}"  # Organization - 组织
-        l = random.choice(cls.CITIES)  # Locality - 城市
-        st = random.choice(cls.STATES)  # State - 州
-        c = random.choice(cls.COUNTRIES)  # Country - 国家
+        l = _rng.choice(cls.CITIES)  # Locality - 城市
+        st = _rng.choice(cls.STATES)  # State - 州
+        c = _rng.choice(cls.COUNTRIES)  # Country - 国家
         
         dname = f"CN={cn}, OU={ou}, O={o}, L={l}, ST={st}, C={c}"
         return dname, {
@@ -172,6 +776,7 @@ class RandomSignatureGenerator:
         # keytool命令
         cmd = [
             str(keytool_path),
+            *(f"-J{flag}" for flag in _JVM_QUICK_FLAGS),
             "-genkeypair",
             "-alias", alias,
             "-keyalg", "RSA",
@@ -216,6 +821,32 @@ class RandomSignatureGenerator:
         except subprocess.CalledProcessError as e:
             print(f"  [X] Keystore生成失败: {e.stderr}")
             return None
+    
+    @classmethod
+    def get_or_create_shared_keystore(cls, config):
+        """
+        获取共享keystore，不存在时生成（整个批次只生成一次）
+        
+        多个进程同时转换时通过文件锁保证只有一个进程执行keytool
+        
+        Args:
+            config: 配置对象
+        
+        Returns:
+            dict: 包含keystore信息的字典，失败返回None
+        """
+        keystore_dir = config.keystore_dir
+        keystore_dir.mkdir(parents=True, exist_ok=True)
+        
+        keystore_path = keystore_dir / f"{cls.SHARED_KEYSTORE_NAME}.jks"
+        keystore_json = keystore_path.with_suffix('.json')
+        
+        with _file_lock(keystore_dir / f"{cls.SHARED_KEYSTORE_NAME}.lock"):
+            if keystore_path.exists() and keystore_json.exists():
+                with open(keystore_json, 'rb') as f:
+                    return json_loads(f.read())
+            
+            return cls.generate_keystore(config.keytool, keystore_path)
 
 
 class APKtoAABConverter:
@@ -224,6 +855,16 @@ class APKtoAABConverter:
     def __init__(self, config):
         self.config = config
         
+    def _proto_cmd(self, apk_path, output_path):
+        """aapt2 convert 命令"""
+        return [
+            str(self.config.aapt2),
+            "convert",
+            "-o", str(output_path),
+            "--output-format", "proto",
+            str(apk_path)
+        ]
+    
     def convert_apk_to_proto(self, apk_path, output_path):
         """
         使用aapt2将APK转换为proto格式
@@ -235,42 +876,30 @@ class APKtoAABConverter:
         Returns:
             bool: 是否成功
         """
-        cmd = [
-            str(self.config.aapt2),
-            "convert",
-            "-o", str(output_path),
-            "--output-format", "proto",
-            str(apk_path)
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
+        returncode, output = _run_tool(self._proto_cmd(apk_path, output_path))
         
         # aapt2 convert会输出警告但仍然成功
-        if result.returncode != 0:
-            print(f"  [X] aapt2 convert错误: {result.stderr}")
+        if returncode != 0:
+            print(f"  [X] aapt2 convert错误: {output}")
             return False
         
         return True
     
-    def extract_proto_apk(self, proto_apk_path, output_dir):
-        """解压proto格式的APK"""
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+    async def convert_apk_to_proto_async(self, apk_path, output_path):
+        """convert_apk_to_proto 的异步版本"""
+        returncode, output = await _run_tool_async(self._proto_cmd(apk_path, output_path))
         
-        with zipfile.ZipFile(proto_apk_path, 'r') as zf:
-            zf.extractall(output_path)
+        if returncode != 0:
+            print(f"  [X] aapt2 convert错误: {output}")
+            return False
         
-        return output_path
+        return True
     
-    def create_base_module(self, extracted_dir, output_dir):
+    def build_base_zip_from_proto(self, proto_apk, base_zip):
         """
-        从proto APK创建base模块目录结构
+        直接从proto APK流式生成base模块zip（不解压到磁盘）
         
-        Proto APK结构已经是:
+        Proto APK结构:
         - AndroidManifest.xml (proto格式)
         - resources.pb (proto格式的资源表)
         - res/ (资源文件)
@@ -286,143 +915,120 @@ class APKtoAABConverter:
         ├── lib/
         ├── assets/
         └── root/
-        """
-        base_dir = Path(output_dir) / "base"
-        base_dir.mkdir(parents=True, exist_ok=True)
-        
-        apk_dir = Path(extracted_dir)
-        
-        # 1. 创建manifest目录并复制AndroidManifest.xml
-        manifest_dir = base_dir / "manifest"
-        manifest_dir.mkdir(exist_ok=True)
-        
-        manifest_src = apk_dir / "AndroidManifest.xml"
-        if manifest_src.exists():
-            shutil.copy2(manifest_src, manifest_dir / "AndroidManifest.xml")
-        
-        # 2. 创建dex目录并复制所有dex文件
-        dex_dir = base_dir / "dex"
-        dex_dir.mkdir(exist_ok=True)
-        
-        for dex_file in apk_dir.glob("*.dex"):
-            shutil.copy2(dex_file, dex_dir / dex_file.name)
-        
-        # 3. 复制res目录
-        res_src = apk_dir / "res"
-        if res_src.exists():
-            res_dst = base_dir / "res"
-            if res_dst.exists():
-                shutil.rmtree(res_dst)
-            shutil.copytree(res_src, res_dst)
-        
-        # 4. 复制lib目录（native库）
-        lib_src = apk_dir / "lib"
-        if lib_src.exists():
-            lib_dst = base_dir / "lib"
-            if lib_dst.exists():
-                shutil.rmtree(lib_dst)
-            shutil.copytree(lib_src, lib_dst)
-        
-        # 5. 复制assets目录
-        assets_src = apk_dir / "assets"
-        if assets_src.exists():
-            assets_dst = base_dir / "assets"
-            if assets_dst.exists():
-                shutil.rmtree(assets_dst)
-            shutil.copytree(assets_src, assets_dst)
-        
-        # 6. 创建root目录存放其他文件
-        root_dir = base_dir / "root"
-        root_dir.mkdir(exist_ok=True)
-        
-        # 复制resources.pb（proto格式的资源表）
-        resources_pb = apk_dir / "resources.pb"
-        if resources_pb.exists():
-            shutil.copy2(resources_pb, base_dir / "resources.pb")
-        
-        # 已处理的文件/目录
-        excluded_items = {
-            'AndroidManifest.xml', 'res', 'lib', 'assets', 
-            'resources.pb', 'META-INF'
-        }
         
-        # Bundle保留的文件/目录名（不能在root目录中使用）
-        reserved_names = {
-            'resources.arsc', 'resources.pb', 'manifest', 
-            'dex', 'res', 'lib', 'assets', 'root'
-        }
-        
-        # 复制其他文件到root目录
-        for item in apk_dir.iterdir():
-            # 跳过已处理的和dex文件
-            if item.name in excluded_items or item.name.endswith('.dex'):
-                continue
-            
-            # 处理保留名称 - 重命名
-            dst_name = item.name
-            if item.name.lower() in reserved_names or item.name in reserved_names:
-                dst_name = f"_{item.name}_"
-                print(f"  [!] 重命名保留名称: {item.name} -> {dst_name}")
-            
-            dst_path = root_dir / dst_name
-            try:
-                if item.is_file():
-                    shutil.copy2(item, dst_path)
-                elif item.is_dir():
-                    if dst_path.exists():
-                        shutil.rmtree(dst_path)
-                    shutil.copytree(item, dst_path)
-            except Exception as e:
-                print(f"  [!] 复制跳过 {item.name}: {e}")
-        
-        return base_dir
-    
-    def create_base_zip(self, base_dir, output_zip):
-        """将base模块打包为zip"""
-        base_path = Path(base_dir)
-        output_path = Path(output_zip)
-        
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for file in base_path.rglob('*'):
-                if file.is_file():
-                    arcname = file.relative_to(base_path)
-                    zf.write(file, arcname)
+        每个条目在读取时即按上述结构改写路径，直接写入base.zip，
+        省去解压、复制到模块目录、再打包的三次完整磁盘读写
+        """
+        # 落入root目录的顶层名称 -> 改写后的名称（每个顶层名称只判断一次保留名）
+        root_tops = {}
+        output_path = Path(base_zip)
+        
+        # aapt2 convert不支持输出到stdout，proto APK刚写入磁盘（仍在页缓存中），
+        # 用mmap映射后直接读取，避免逐块read()的额外复制
+        with open(proto_apk, 'rb') as fh, \
+                mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                zipfile.ZipFile(_MappedFile(mapped), 'r') as src, \
+                zipfile.ZipFile(output_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as dst:
+            for info in src.infolist():
+                if info.is_dir():
+                    continue
+                
+                name = info.filename
+                top, sep, rest = name.partition('/')
+                
+                if not sep:
+                    # 顶层文件
+                    if name == 'AndroidManifest.xml':
+                        arcname = 'manifest/AndroidManifest.xml'
+                    elif name == 'resources.pb':
+                        arcname = name
+                    elif name.endswith('.dex'):
+                        arcname = f"dex/{name}"
+                    else:
+                        arcname = None
+                elif top in _PASSTHROUGH_DIRS:
+                    arcname = name
+                elif top == 'META-INF':
+                    continue
+                else:
+                    arcname = None
+                
+                # 其他文件放入root目录，保留名称需要重命名
+                # 常见的proto APK没有这类条目，整个分支不会执行
+                if arcname is None:
+                    dst_top = root_tops.get(top)
+                    if dst_top is None:
+                        dst_top = top
+                        if top.lower() in _RESERVED_NAMES:
+                            dst_top = f"_{top}_"
+                            print(f"  [!] 重命名保留名称: {top} -> {dst_top}")
+                        root_tops[top] = dst_top
+                    arcname = f"root/{dst_top}{sep}{rest}"
+                
+                # 中间文件不压缩，bundletool构建AAB时会统一压缩
+                zinfo = zipfile.ZipInfo(arcname, date_time=_ZIP_EPOCH)
+                zinfo.compress_type = zipfile.ZIP_STORED
+                zinfo.external_attr = info.external_attr
+                zinfo.file_size = info.file_size
+                
+                with src.open(info) as fsrc, dst.open(zinfo, 'w') as fdst:
+                    shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
         
         return output_path
     
-    def build_aab(self, base_zip, output_aab):
-        """使用bundletool构建AAB"""
-        # 如果输出文件已存在，先删除
+    @staticmethod
+    def _remove_old_aab(output_aab):
+        """构建前删除已存在的AAB（bundletool build-bundle不会覆盖已有文件）"""
         output_path = Path(output_aab)
         if output_path.exists():
             output_path.unlink()
             print(f"  [i] 删除已存在的AAB: {output_path.name}")
-        
-        cmd = [
-            str(self.config.java),
-            "-jar", str(self.config.bundletool),
+    
+    def _build_aab_cmd(self, base_zip, output_aab):
+        """bundletool build-bundle 命令"""
+        return [
+            *_bundletool_cmd(self.config),
             "build-bundle",
             f"--modules={base_zip}",
             f"--output={output_aab}"
         ]
+    
+    def build_aab(self, base_zip, output_aab):
+        """使用bundletool构建AAB"""
+        self._remove_old_aab(output_aab)
+        cmd = self._build_aab_cmd(base_zip, output_aab)
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
+        with _jvm_slot():
+            returncode, output = _run_tool(cmd)
         
-        if result.returncode != 0:
-            print(f"  [X] bundletool错误: {result.stderr}")
+        if returncode != 0:
+            print(f"  [X] bundletool错误: {output}")
+            # 失败（或被中途结束）时删除不完整的AAB
+            Path(output_aab).unlink(missing_ok=True)
             return False
         
         return True
     
-    def sign_aab(self, aab_path, keystore_info):
-        """使用jarsigner签名AAB"""
-        cmd = [
+    async def build_aab_async(self, base_zip, output_aab, jvm_semaphore=None):
+        """build_aab 的异步版本（jvm_semaphore: 限制同时运行的JVM数量，默认使用批量模式的名额）"""
+        self._remove_old_aab(output_aab)
+        cmd = self._build_aab_cmd(base_zip, output_aab)
+        
+        async with _jvm_slot_async(jvm_semaphore):
+            returncode, output = await _run_tool_async(cmd)
+        
+        if returncode != 0:
+            print(f"  [X] bundletool错误: {output}")
+            Path(output_aab).unlink(missing_ok=True)
+            return False
+        
+        return True
+    
+    def _sign_cmd(self, aab_path, keystore_info):
+        """jarsigner 签名命令"""
+        return [
             str(self.config.jarsigner),
-            "-verbose",
+            *(f"-J{flag}" for flag in _JVM_QUICK_FLAGS),
             "-sigalg", "SHA256withRSA",
             "-digestalg", "SHA-256",
             "-keystore", keystore_info["keystore_file"],
@@ -431,62 +1037,161 @@ class APKtoAABConverter:
             str(aab_path),
             keystore_info["key_alias"]
         ]
+    
+    def sign_aab(self, aab_path, keystore_info):
+        """使用jarsigner签名AAB"""
+        returncode, output = _run_tool(self._sign_cmd(aab_path, keystore_info))
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
+        if returncode != 0:
+            print(f"  [X] 签名错误: {output}")
+            return False
+        
+        return True
+    
+    async def sign_aab_async(self, aab_path, keystore_info, jvm_semaphore=None):
+        """sign_aab 的异步版本（jarsigner同样是JVM，与build_aab_async共用名额）"""
+        async with _jvm_slot_async(jvm_semaphore):
+            returncode, output = await _run_tool_async(self._sign_cmd(aab_path, keystore_info))
         
-        if result.returncode != 0:
-            print(f"  [X] 签名错误: {result.stderr}")
+        if returncode != 0:
+            print(f"  [X] 签名错误: {output}")
             return False
         
         return True
     
-    def get_package_info_from_aapt2(self, apk_path):
-        """使用aapt2获取APK包信息"""
-        cmd = [
-            str(self.config.aapt2),
-            "dump", "badging",
-            str(apk_path)
-        ]
+    def sign_aabs_batch(self, aab_paths, keystore_info, workers=None):
+        """
+        使用同一个keystore批量签名多个AAB
+        
+        jarsigner每次只能签名一个文件，这里用线程池同时启动多个jarsigner，
+        让各JVM的启动开销相互重叠
+        
+        Args:
+            aab_paths: AAB文件路径列表
+            keystore_info: keystore信息字典
+            workers: 同时运行的jarsigner数量（默认CPU核心数）
+        
+        Returns:
+            dict: {AAB路径字符串: 是否签名成功}
+        """
+        aab_paths = [str(p) for p in aab_paths]
+        if not aab_paths:
+            return {}
+        
+        workers = min(workers or os.cpu_count() or 1, len(aab_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.sign_aab, aab_path, keystore_info): aab_path
+                for aab_path in aab_paths
+            }
+            wait(futures)
+        
+        results = {}
+        for future, aab_path in futures.items():
+            try:
+                results[aab_path] = future.result()
+            except Exception as e:
+                print(f"  [X] 签名错误 {Path(aab_path).name}: {e}")
+                results[aab_path] = False
+        return results
+    
+    def resolve_keystore(self, apk_name, shared_keystore=True):
+        """
+        确定APK使用的keystore：优先同名keystore，其次共享keystore，否则生成新的
+        
+        Returns:
+            dict: 包含keystore信息的字典，失败返回None
+        """
+        keystore_path = self.config.keystore_dir / f"{apk_name}.jks"
+        keystore_json = self.config.keystore_dir / f"{apk_name}.json"
+        
+        # 检查是否已存在 keystore
+        if keystore_path.exists() and keystore_json.exists():
+            print(f"  [i] 发现已存在的keystore: {keystore_path.name}")
+            with open(keystore_json, 'rb') as f:
+                keystore_info = json_loads(f.read())
+            print(f"     别名: {keystore_info.get('key_alias', 'N/A')}")
+            return keystore_info
+        
+        if shared_keystore:
+            # 使用共享keystore（整个批次只生成一次）
+            keystore_info = RandomSignatureGenerator.get_or_create_shared_keystore(self.config)
+            if keystore_info:
+                print(f"  [i] 使用共享keystore: {Path(keystore_info['keystore_file']).name}")
+            return keystore_info
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
+        # 生成随机keystore
+        return RandomSignatureGenerator.generate_keystore(
+            self.config.keytool,
+            keystore_path
         )
+    
+    @staticmethod
+    def _parse_badging_line(line, info):
+        """从一行aapt2 dump badging输出中提取字段（每个字段取第一次出现的值），全部获取后返回True"""
+        for match in _BADGING_RE.finditer(line):
+            if match.group('pkg') and not info["package_name"]:
+                info["package_name"] = match.group('pkg')
+            elif match.group('vc') and not info["version_code"]:
+                info["version_code"] = match.group('vc')
+            elif match.group('vn') and not info["version_name"]:
+                info["version_name"] = match.group('vn')
+        return all(info.values())
+    
+    def get_package_info_from_aapt2(self, apk_path):
+        """
+        使用aapt2获取APK包信息
         
-        package_name = ""
-        version_code = ""
-        version_name = ""
+        所需字段都在输出的第一行（package: ...），逐行读取，拿到后立即结束aapt2，
+        不必缓存整个badging输出（大型应用可达数百KB）
+        """
+        info = {"package_name": "", "version_code": "", "version_name": ""}
+        cmd = [str(self.config.aapt2), "dump", "badging", str(apk_path)]
         
-        if result.returncode == 0:
-            output = result.stdout
-            
-            # 提取包名
-            match = re.search(r"package: name='([^']+)'", output)
-            if match:
-                package_name = match.group(1)
-            
-            # 提取版本号
-            match = re.search(r"versionCode='(\d+)'", output)
-            if match:
-                version_code = match.group(1)
-            
-            # 提取版本名
-            match = re.search(r"versionName='([^']+)'", output)
-            if match:
-                version_name = match.group(1)
-        
-        return {
-            "package_name": package_name,
-            "version_code": version_code,
-            "version_name": version_name
-        }
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        with _tracked_tool(proc):
+            try:
+                for line in proc.stdout:
+                    if self._parse_badging_line(line, info):
+                        break
+            finally:
+                if proc.poll() is None:
+                    proc.terminate()
+                proc.stdout.close()
+                proc.wait()
+        
+        return info
+    
+    async def get_package_info_from_aapt2_async(self, apk_path):
+        """get_package_info_from_aapt2 的异步版本"""
+        info = {"package_name": "", "version_code": "", "version_name": ""}
+        cmd = [str(self.config.aapt2), "dump", "badging", str(apk_path)]
+        encoding = locale.getpreferredencoding(False)
+        
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        with _tracked_tool(proc):
+            try:
+                while True:
+                    line = await proc.stdout.readline()
+                    if not line:
+                        break
+                    if self._parse_badging_line(line.decode(encoding, errors='replace'), info):
+                        break
+            finally:
+                if proc.returncode is None:
+                    try:
+                        proc.terminate()
+                    except ProcessLookupError:
+                        pass
+                await proc.wait()
+        
+        return info
     
-    def convert(self, apk_path, auto_sign=True, output_dir=None):
+    def convert(self, apk_path, auto_sign=True, output_dir=None, shared_keystore=True):
         """
         完整的APK转AAB转换流程
         
@@ -494,12 +1199,26 @@ class APKtoAABConverter:
             apk_path: APK文件路径
             auto_sign: 是否自动生成签名
             output_dir: 自定义输出目录（可选，默认使用config中的aab_dir）
+            shared_keystore: 没有同名keystore时使用共享keystore，而不是为每个APK单独生成
         
         Returns:
             str: 生成的AAB文件路径，失败返回None
         """
+        return asyncio.run(self.convert_async(
+            apk_path, auto_sign=auto_sign, output_dir=output_dir, shared_keystore=shared_keystore
+        ))
+    
+    async def convert_async(self, apk_path, auto_sign=True, output_dir=None, shared_keystore=True,
+                            jvm_semaphore=None):
+        """
+        convert 的异步实现（jvm_semaphore: 限制bundletool/jarsigner同时运行数量的信号量，可选）
+        
+        获取包信息与aapt2 proto转换互不依赖，同时进行；生成模块成功后才准备keystore
+        （与构建AAB同时进行），proto转换或生成模块失败的APK不会留下新生成的keystore
+        """
         apk_path = Path(apk_path)
         apk_name = apk_path.stem
+        loop = asyncio.get_running_loop()
         
         # 确定输出目录
         if output_dir:
@@ -512,84 +1231,211 @@ class APKtoAABConverter:
         print(f"[*] 开始转换: {apk_path.name}")
         print(f"{'='*60}")
         
-        # 获取包信息
-        print("\n[1/6] 获取APK信息...")
-        pkg_info = self.get_package_info_from_aapt2(apk_path)
-        if pkg_info['package_name']:
-            print(f"  [i] 包名: {pkg_info['package_name']}")
-            print(f"  [i] 版本: {pkg_info['version_name']} ({pkg_info['version_code']})")
-        else:
-            print("  [!] 无法获取包信息，继续转换...")
-        
-        # 创建临时工作目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # 创建临时工作目录（proto.apk + base.zip 约为APK大小的数倍，空间足够时放在内存盘）
+        with _pick_temp_dir(apk_path.stat().st_size * 4) as temp_root, \
+                tempfile.TemporaryDirectory(dir=temp_root) as temp_dir:
             temp_path = Path(temp_dir)
-            
-            # 2. 使用aapt2将APK转换为proto格式
-            print("\n[2/6] 转换APK为Proto格式...")
             proto_apk = temp_path / "proto.apk"
-            if not self.convert_apk_to_proto(apk_path, proto_apk):
-                return None
-            print(f"  [OK] Proto APK生成成功")
             
-            # 3. 解压proto APK
-            print("\n[3/6] 解压Proto APK...")
-            extracted_dir = temp_path / "extracted"
-            self.extract_proto_apk(proto_apk, extracted_dir)
-            print(f"  [OK] 解压完成")
+            # 1-2. 获取包信息、转换proto格式，并发执行
+            print("\n[1/5] 获取APK信息...")
+            print("\n[2/5] 转换APK为Proto格式...")
+            pkg_info, proto_ok = await asyncio.gather(
+                self.get_package_info_from_aapt2_async(apk_path),
+                self.convert_apk_to_proto_async(apk_path, proto_apk),
+            )
             
-            # 4. 创建Bundle模块结构
-            print("\n[4/6] 创建Bundle模块结构...")
-            module_dir = temp_path / "module"
-            base_dir = self.create_base_module(extracted_dir, module_dir)
-            print(f"  [OK] 模块结构创建完成")
+            if pkg_info['package_name']:
+                print(f"  [i] 包名: {pkg_info['package_name']}")
+                print(f"  [i] 版本: {pkg_info['version_name']} ({pkg_info['version_code']})")
+            else:
+                print("  [!] 无法获取包信息，继续转换...")
             
-            # 5. 打包为base.zip
-            print("\n[5/6] 打包模块并构建AAB...")
+            if not proto_ok:
+                return None
+            print(f"  [OK] Proto APK生成成功")
+            
+            # 3. 从proto APK直接生成Bundle模块base.zip
+            print("\n[3/5] 创建Bundle模块...")
             base_zip = temp_path / "base.zip"
-            self.create_base_zip(base_dir, base_zip)
+            await loop.run_in_executor(None, self.build_base_zip_from_proto, proto_apk, base_zip)
+            print(f"  [OK] 模块创建完成")
+            
+            # 签名时在后台准备keystore，与步骤4同时进行
+            keystore_job = None
+            if auto_sign:
+                keystore_job = loop.run_in_executor(None, self.resolve_keystore, apk_name, shared_keystore)
             
-            # 构建AAB
+            # 4. 构建AAB
+            print("\n[4/5] 构建AAB...")
             output_aab = out_dir / f"{apk_name}.aab"
             
-            if not self.build_aab(base_zip, output_aab):
+            try:
+                aab_ok = await self.build_aab_async(base_zip, output_aab, jvm_semaphore)
+            except BaseException:
+                # 构建出错（或被取消）时也等keystore任务结束并取走其结果，不留下未完成的后台任务
+                if keystore_job:
+                    await asyncio.gather(keystore_job, return_exceptions=True)
+                raise
+            # 即使构建失败也等待keystore准备完成（不留下未完成的后台任务）
+            keystore_info = await keystore_job if keystore_job else None
+            if not aab_ok:
                 return None
             print(f"  [OK] AAB构建完成: {output_aab.name}")
             
-            # 6. 签名AAB
+            # 5. 签名AAB
             if auto_sign:
-                print("\n[6/6] 生成签名并签名AAB...")
-                
-                keystore_path = self.config.keystore_dir / f"{apk_name}.jks"
-                keystore_json = self.config.keystore_dir / f"{apk_name}.json"
-                
-                # 检查是否已存在 keystore
-                if keystore_path.exists() and keystore_json.exists():
-                    print(f"  [i] 发现已存在的keystore: {keystore_path.name}")
-                    with open(keystore_json, 'r', encoding='utf-8') as f:
-                        keystore_info = json.load(f)
-                    print(f"     别名: {keystore_info.get('key_alias', 'N/A')}")
-                else:
-                    # 生成随机keystore
-                    keystore_info = RandomSignatureGenerator.generate_keystore(
-                        self.config.keytool,
-                        keystore_path
-                    )
+                print("\n[5/5] 签名AAB...")
                 
                 if keystore_info:
-                    if self.sign_aab(output_aab, keystore_info):
+                    if await self.sign_aab_async(output_aab, keystore_info, jvm_semaphore):
                         print(f"  [OK] AAB签名完成")
                     else:
                         print(f"  [!] AAB签名失败，但AAB文件已生成")
                 else:
                     print(f"  [!] Keystore生成失败，AAB未签名")
             else:
-                print("\n[6/6] 跳过签名")
+                print("\n[5/5] 跳过签名")
         
         print(f"\n[OK] 转换完成: {output_aab}")
         return str(output_aab)
 
 
+def _convert_apk_worker(config, apk_path, output_dir):
+    """进程池任务：在独立进程中转换单个APK（每个任务使用独立的临时目录，签名由主进程统一完成）"""
+    return APKtoAABConverter(config).convert(apk_path, auto_sign=False, output_dir=output_dir)
+
+
+def convert_batch(config, apk_paths, workers=None, auto_sign=True, output_dir=None, max_jvms=None,
+                  progress=None):
+    """
+    使用进程池并发转换多个APK为AAB
+    
+    Args:
+        config: 配置对象
+        apk_paths: APK文件路径列表
+        workers: 并发进程数（默认CPU核心数）
+        auto_sign: 是否自动生成签名
+        output_dir: 自定义输出目录（可选）
+        max_jvms: 同时运行的bundletool/jarsigner JVM上限（默认为进程数的一半，避免内存抖动）
+        progress: 每完成一个APK时调用 progress(已完成数, 总数)（可选，在调用线程中执行）
+    
+    所有AAB生成后再按keystore分组批量签名
+    
+    Returns:
+        dict: {APK路径字符串: 生成的AAB路径或None}
+    """
+    apk_paths = [str(p) for p in apk_paths]
+    if not apk_paths:
+        return {}
+    
+    workers = min(workers or os.cpu_count() or 1, len(apk_paths))
+    max_jvms = max_jvms or max(1, workers // 2)
+    output_dir = str(output_dir) if output_dir else None
+    
+    results = {}
+    jvm_semaphore = multiprocessing.Semaphore(max_jvms)
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_batch_worker,
+                             initargs=(jvm_semaphore,)) as executor:
+        futures = {
+            executor.submit(_convert_apk_worker, config, apk_path, output_dir): apk_path
+            for apk_path in apk_paths
+        }
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            apk_path = futures[future]
+            try:
+                results[apk_path] = future.result()
+            except Exception as e:
+                print(f"[X] 转换失败 {Path(apk_path).name}: {e}")
+                results[apk_path] = None
+            status = "[OK]" if results[apk_path] else "[X]"
+            print(f"\n[{done}/{len(apk_paths)}] {status} {Path(apk_path).name}")
+            if progress:
+                progress(done, len(apk_paths))
+    
+    if auto_sign:
+        converter = APKtoAABConverter(config)
+        
+        # 按keystore分组，同一keystore的AAB一起签名
+        groups = {}
+        for apk_path in apk_paths:
+            aab_path = results[apk_path]
+            if not aab_path:
+                continue
+            keystore_info = converter.resolve_keystore(Path(apk_path).stem)
+            if not keystore_info:
+                print(f"  [!] Keystore生成失败，AAB未签名: {Path(aab_path).name}")
+                continue
+            group = groups.setdefault(keystore_info["keystore_file"], (keystore_info, []))
+            group[1].append(aab_path)
+        
+        for keystore_info, aab_paths in groups.values():
+            print(f"\n[*] 使用 {Path(keystore_info['keystore_file']).name} 签名 {len(aab_paths)} 个AAB...")
+            signed = converter.sign_aabs_batch(aab_paths, keystore_info, workers=max_jvms)
+            for aab_path, ok in signed.items():
+                if ok:
+                    print(f"  [OK] AAB签名完成: {Path(aab_path).name}")
+                else:
+                    print(f"  [!] AAB签名失败，但AAB文件已生成: {Path(aab_path).name}")
+    
+    return results
+
+
+async def convert_batch_async(config, apk_paths, auto_sign=True, output_dir=None, limit=None,
+                              progress=None, on_done=None, cancel=None, jvm_semaphore=None, converter=None):
+    """
+    在单个事件循环中并发转换多个APK为AAB（比进程池占用更少内存）
+    
+    用法: results = asyncio.run(convert_batch_async(config, apk_paths))
+    
+    Args:
+        config: 配置对象
+        apk_paths: APK文件路径列表
+        auto_sign: 是否自动生成签名
+        output_dir: 自定义输出目录（可选）
+        limit: 同时转换的APK数量上限（默认CPU核心数）
+        progress: 进度回调 progress(已完成数, 总数)，每完成一个APK调用一次（可选）
+        on_done: 结果回调 on_done(APK路径字符串, AAB路径或None)，每完成一个APK立即调用（可选）
+        cancel: threading.Event（可选），设置后不再开始新的APK，正在转换的APK会继续完成
+        jvm_semaphore: threading.Semaphore等（可选），限制同时运行的bundletool/jarsigner JVM数量；
+            limit只限制同时处理的APK数，aapt2等步骤不受此限制
+        converter: 复用的APKtoAABConverter实例（可选，默认新建）
+    
+    Returns:
+        dict: {APK路径字符串: 生成的AAB路径或None}，因取消而未开始的APK不在结果中
+    """
+    apk_paths = [str(p) for p in apk_paths]
+    semaphore = asyncio.Semaphore(limit or os.cpu_count() or 1)
+    converter = converter or APKtoAABConverter(config)
+    done = 0
+    
+    skipped = object()
+    
+    async def convert_one(apk_path):
+        nonlocal done
+        async with semaphore:
+            if cancel is not None and cancel.is_set():
+                return skipped
+            try:
+                result = await converter.convert_async(apk_path, auto_sign=auto_sign, output_dir=output_dir,
+                                                       jvm_semaphore=jvm_semaphore)
+            except Exception as e:
+                print(f"[X] 转换失败 {Path(apk_path).name}: {e}")
+                result = None
+        
+        done += 1
+        if on_done:
+            on_done(apk_path, result)
+        if progress:
+            progress(done, len(apk_paths))
+        return result
+    
+    results = await asyncio.gather(*(convert_one(p) for p in apk_paths))
+    return {p: r for p, r in zip(apk_paths, results) if r is not skipped}
+
+
 class AABtoAPKSConverter:
     """AAB转APKS转换器 - 支持bundletool所有模式"""
     
@@ -610,24 +1456,20 @@ class AABtoAPKSConverter:
     def find_keystore_for_aab(self, aab_name):
         """
         查找AAB对应的keystore文件
-        优先查找同名的keystore，否则使用第一个可用的keystore
+        优先查找同名的keystore，其次是共享keystore，否则使用第一个可用的keystore
         """
-        # 尝试查找同名的keystore
-        keystore_json = self.config.keystore_dir / f"{aab_name}.json"
-        if keystore_json.exists():
-            with open(keystore_json, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        
-        # 查找任意可用的keystore
-        for json_file in self.config.keystore_dir.glob("*.json"):
-            with open(json_file, 'r', encoding='utf-8') as f:
-                info = json.load(f)
-                keystore_path = Path(info.get("keystore_file", ""))
-                if keystore_path.exists():
-                    print(f"  [!] 使用keystore: {keystore_path.name}")
-                    return info
+        keystores = _load_keystores(self.config.keystore_dir)
         
-        return None
+        # 尝试查找同名的keystore，其次是APK转AAB时使用的共享keystore
+        for name in (aab_name, RandomSignatureGenerator.SHARED_KEYSTORE_NAME):
+            if name in keystores:
+                return keystores[name]
+        
+        # 使用任意可用的keystore
+        info = keystores.get(_ANY_KEYSTORE)
+        if info:
+            print(f"  [!] 使用keystore: {Path(info['keystore_file']).name}")
+        return info
     
     def build_apks(self, aab_path, output_path, keystore_info=None, mode="default", 
                    device_spec=None, local_testing=False, verbose=False):
@@ -647,8 +1489,7 @@ class AABtoAPKSConverter:
             bool: 是否成功
         """
         cmd = [
-            str(self.config.java),
-            "-jar", str(self.config.bundletool),
+            *_bundletool_cmd(self.config),
             "build-apks",
             f"--bundle={aab_path}",
             f"--output={output_path}",
@@ -683,18 +1524,16 @@ class AABtoAPKSConverter:
                 f"--key-pass=pass:{keystore_info['key_password']}"
             ])
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
+        returncode, output = _run_tool(cmd)
         
-        if result.returncode != 0:
-            print(f"  [X] bundletool错误: {result.stderr}")
+        if returncode != 0:
+            print(f"  [X] bundletool错误: {output}")
+            # 失败（或被中途结束）时删除不完整的APKS，避免之后被当作已是最新的输出
+            Path(output_path).unlink(missing_ok=True)
             return False
         
-        if verbose and result.stdout:
-            print(result.stdout)
+        if verbose and output:
+            print(output)
         
         return True
     
@@ -807,6 +1646,8 @@ class SplitAPKtoAPKConverter:
     
     # 支持的文件扩展名
     SUPPORTED_EXTENSIONS = ['.apks', '.xapk', '.apkm']
+    # 扩展名集合（小写），用于格式判断和目录扫描
+    SUPPORTED_SUFFIXES = frozenset(SUPPORTED_EXTENSIONS)
     
     def __init__(self, config):
         self.config = config
@@ -816,7 +1657,7 @@ class SplitAPKtoAPKConverter:
         file_path = Path(file_path)
         ext = file_path.suffix.lower()
         
-        if ext in self.SUPPORTED_EXTENSIONS:
+        if ext in self.SUPPORTED_SUFFIXES:
             return ext[1:]  # 去掉点号
         return None
     
@@ -824,6 +1665,8 @@ class SplitAPKtoAPKConverter:
         """
         分析压缩包内容，确定最佳提取策略
         
+        只读取中央目录（条目名称）和manifest.json/info.json，不解压任何内层APK
+        
         Returns:
             dict: 包含分析结果的字典
         """
@@ -836,45 +1679,46 @@ class SplitAPKtoAPKConverter:
             "split_apks": [],
             "all_apks": [],
             "manifest": None,
+            "package_info": None,
             "obb_files": []
         }
         
         try:
-            with zipfile.ZipFile(archive_path, 'r') as zf:
-                file_list = zf.namelist()
+            # 大缓冲区读取中央目录，减少网络盘/杀毒软件监控目录上的read()调用次数
+            with open(archive_path, 'rb', buffering=1024 * 1024) as fh, \
+                    zipfile.ZipFile(fh, 'r') as zf:
+                all_apks = result["all_apks"]
+                split_apks = result["split_apks"]
+                obb_files = result["obb_files"]
                 
-                for name in file_list:
+                # 每个条目只转换一次小写，按扩展名分派
+                for info in zf.infolist():
+                    name = info.filename
                     name_lower = name.lower()
                     
                     # 查找APK文件
                     if name_lower.endswith('.apk'):
-                        result["all_apks"].append(name)
+                        all_apks.append(name)
                         
                         # 检查是否是universal APK
-                        if 'universal' in name_lower or 'standalone' in name_lower:
+                        if any(m in name_lower for m in _UNIVERSAL_APK_MARKERS):
                             result["has_universal"] = True
                             result["base_apk"] = name
                         # 检查base APK
-                        elif 'base' in name_lower and 'master' in name_lower:
+                        elif ('base' in name_lower and 'master' in name_lower) or name_lower.endswith('base.apk'):
                             if not result["base_apk"]:
                                 result["base_apk"] = name
-                        elif name_lower.endswith('base.apk') or name_lower == 'base.apk':
-                            if not result["base_apk"]:
-                                result["base_apk"] = name
-                        # 配置拆分APK
-                        elif 'config.' in name_lower or 'split_config' in name_lower:
-                            result["split_apks"].append(name)
-                        # 其他拆分APK (XAPK格式)
-                        elif 'split_' in name_lower:
-                            result["split_apks"].append(name)
+                        # 配置拆分APK / 其他拆分APK (XAPK格式)
+                        elif any(m in name_lower for m in _SPLIT_APK_MARKERS):
+                            split_apks.append(name)
+                    
+                    # 查找OBB文件
+                    elif name_lower.endswith('.obb'):
+                        obb_files.append(name)
                     
                     # 查找manifest文件 (XAPK/APKM)
-                    if name_lower == 'manifest.json' or name_lower == 'info.json':
+                    elif name_lower in _MANIFEST_NAMES:
                         result["manifest"] = name
-                    
-                    # 查找OBB文件
-                    if name_lower.endswith('.obb'):
-                        result["obb_files"].append(name)
                 
                 # 如果没找到明确的base APK，使用第一个APK
                 if not result["base_apk"] and result["all_apks"]:
@@ -888,6 +1732,11 @@ class SplitAPKtoAPKConverter:
                     if not result["base_apk"]:
                         result["base_apk"] = result["all_apks"][0]
                 
+                # 包信息在同一次打开中读取（只解压manifest这一个小条目），
+                # 不再为此重新打开压缩包、解析中央目录
+                if result["manifest"]:
+                    result["package_info"] = self._read_manifest_info(zf, result["manifest"])
+                
         except zipfile.BadZipFile:
             print(f"  [X] 无效的压缩文件: {archive_path.name}")
             return None
@@ -900,13 +1749,17 @@ class SplitAPKtoAPKConverter:
         Args:
             auto_sign: 是否重新签名（对于提取的APK，通常已有签名，此参数保留以备将来使用）
         """
-        with zipfile.ZipFile(archive_path, 'r') as zf:
-            # 读取universal APK
-            apk_data = zf.read(analysis["base_apk"])
-            
-            # 写入输出文件
-            with open(output_path, 'wb') as f:
-                f.write(apk_data)
+        with open(archive_path, 'rb') as fh, zipfile.ZipFile(fh, 'r') as zf:
+            info = zf.getinfo(analysis["base_apk"])
+            with open(output_path, 'wb') as dst:
+                if info.compress_type == zipfile.ZIP_STORED:
+                    # 未压缩存放（最常见）：直接复制原始字节区间，不经过ZipExtFile的逐块CRC计算
+                    fh.seek(_entry_data_offset(fh, info))
+                    _copy_bytes(fh, dst, info.compress_size, info.filename)
+                else:
+                    # 以1MB缓冲区流式解压复制，内存占用与APK大小无关
+                    with zf.open(info) as src:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
         
         return True
     
@@ -915,124 +1768,104 @@ class SplitAPKtoAPKConverter:
         合并拆分APK为单一APK
         
         策略：
-        1. 解压所有APK到临时目录
-        2. 合并内容（DEX、资源、库文件等）
-        3. 重新打包并签名（如果auto_sign为True）
+        1. 按base在前的顺序，将各APK的条目原样复制到新APK（DEX按编号累加），
+           复制时即完成STORED条目的对齐
+        2. 签名（如果auto_sign为True）
         
         Args:
             auto_sign: 是否自动签名（默认True）
         """
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
-            merged_dir = temp_path / "merged"
-            merged_dir.mkdir()
+            temp_output = temp_path / "merged.apk"
             
             apks_to_merge = [analysis["base_apk"]] + analysis["split_apks"]
             
             print(f"  [i] 合并 {len(apks_to_merge)} 个APK文件...")
             
-            # 解压所有APK
-            with zipfile.ZipFile(archive_path, 'r') as archive:
-                for apk_name in apks_to_merge:
-                    print(f"     - {Path(apk_name).name}")
-                    
-                    # 提取APK到临时文件
-                    apk_data = archive.read(apk_name)
-                    temp_apk = temp_path / Path(apk_name).name
-                    with open(temp_apk, 'wb') as f:
-                        f.write(apk_data)
-                    
-                    # 解压APK内容
-                    try:
-                        with zipfile.ZipFile(temp_apk, 'r') as apk_zip:
-                            for item in apk_zip.namelist():
-                                # 跳过签名文件
-                                if item.startswith('META-INF/'):
+            # 各APK的条目按原始压缩数据直接复制进合并后的APK（压缩方式保持原样），
+            # 不再解压到磁盘、也不再重新压缩；需要新压缩的条目使用1级DEFLATE（速度约为默认级别的3倍）
+            written = set()
+            next_dex = 2
+            # 所有条目复制共用的缓冲区（每次合并单独分配，批量并发时互不影响）
+            copy_buf = bytearray(1024 * 1024)
+            # 输出文件使用1MB写缓冲：大量小资源条目的文件头和数据合并成少量write()调用
+            with open(archive_path, 'rb') as fh, \
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    zipfile.ZipFile(_MappedFile(mapped), 'r') as archive, \
+                    open(temp_output, 'wb', buffering=1024 * 1024) as out_fh, \
+                    zipfile.ZipFile(out_fh, 'w', zipfile.ZIP_DEFLATED,
+                                    allowZip64=True, compresslevel=1) as out_zip:
+                # 各内层APK的打开（压缩存放时的解压、中央目录解析）互相独立，在线程池中并行完成；
+                # 条目复制只有一个输出文件，仍按base在前的顺序逐个进行
+                apk_infos = [archive.getinfo(name) for name in apks_to_merge]
+                workers = min(8, len(apk_infos), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    apk_zips = list(pool.map(
+                        lambda info: _open_inner_zip(archive, mapped, info), apk_infos
+                    ))
+                
+                try:
+                    for apk_name, apk_zip in zip(apks_to_merge, apk_zips):
+                        print(f"     - {Path(apk_name).name}")
+                        
+                        if apk_zip is None:
+                            print(f"  [!] 跳过无效APK: {Path(apk_name).name}")
+                            continue
+                        
+                        for info in apk_zip.infolist():
+                            item = info.filename
+                            
+                            # 跳过签名文件和目录条目
+                            if item.startswith('META-INF/') or info.is_dir():
+                                continue
+                            
+                            # 如果文件已存在，需要特殊处理
+                            if item in written:
+                                # DEX文件需要特殊处理（按编号累加）
+                                if item.endswith('.dex'):
+                                    # 找到下一个可用的DEX编号（已写入的名称只增不减，
+                                    # 从上次分配的编号继续查找即可）
+                                    while f"classes{next_dex}.dex" in written:
+                                        next_dex += 1
+                                    item = f"classes{next_dex}.dex"
+                                else:
+                                    # 其他文件跳过（使用base APK的版本）
                                     continue
-                                
-                                item_path = merged_dir / item
-                                
-                                # 如果文件已存在，需要特殊处理
-                                if item_path.exists():
-                                    # DEX文件需要特殊处理（按编号累加）
-                                    if item.endswith('.dex'):
-                                        # 找到下一个可用的DEX编号
-                                        dex_num = 2
-                                        while True:
-                                            new_name = f"classes{dex_num}.dex"
-                                            new_path = merged_dir / new_name
-                                            if not new_path.exists():
-                                                item_path = new_path
-                                                break
-                                            dex_num += 1
-                                    else:
-                                        # 其他文件跳过（使用base APK的版本）
-                                        continue
-                                
-                                # 创建目录
-                                item_path.parent.mkdir(parents=True, exist_ok=True)
-                                
-                                # 写入文件
-                                if not item.endswith('/'):
-                                    with open(item_path, 'wb') as f:
-                                        f.write(apk_zip.read(item))
-                    
-                    except zipfile.BadZipFile:
-                        print(f"  [!] 跳过无效APK: {Path(apk_name).name}")
-                        continue
-            
-            # 重新打包为APK
-            print("  [i] 重新打包APK...")
-            temp_output = temp_path / "merged.apk"
+                            
+                            _copy_zip_entry_raw(apk_zip, info, out_zip, item, copy_buf)
+                            written.add(item)
+                finally:
+                    for apk_zip in apk_zips:
+                        if apk_zip is not None:
+                            apk_zip.close()
             
-            with zipfile.ZipFile(temp_output, 'w', zipfile.ZIP_DEFLATED) as out_zip:
-                for file in merged_dir.rglob('*'):
-                    if file.is_file():
-                        arcname = file.relative_to(merged_dir)
-                        out_zip.write(file, arcname)
-            
-            # 对齐APK
-            print("  [i] 对齐APK...")
-            aligned_apk = temp_path / "aligned.apk"
-            
-            cmd = [
-                str(self.config.zipalign),
-                "-f", "-p", "4",
-                str(temp_output),
-                str(aligned_apk)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                print(f"  [!] zipalign警告: {result.stderr}")
-                # 即使对齐失败也继续
-                aligned_apk = temp_output
+            # 复制条目时已完成对齐，不再运行zipalign（省去一次完整的读写和进程启动）
+            aligned_apk = temp_output
             
             # 签名APK
             if auto_sign:
                 print("  [i] 签名APK...")
                 
-                # 查找可用的keystore
-                keystore_info = None
-                for json_file in self.config.keystore_dir.glob("*.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            info = json.load(f)
-                            if Path(info.get("keystore_file", "")).exists():
-                                keystore_info = info
-                                break
-                    except:
-                        continue
+                # 查找可用的keystore（目录未变化时直接使用缓存，不再逐个解析JSON）
+                keystore_info = self.config.get_keystore()
                 
                 if keystore_info:
-                    # 使用apksigner签名
-                    apksigner = self.config.tools_dir / "android-sdk" / "build-tools" / "35.0.0" / "apksigner.bat"
+                    # 使用apksigner签名（优先直接用java运行apksigner.jar，省去批处理脚本的额外进程）
+                    build_tools = self.config.tools_dir / "android-sdk" / "build-tools" / "35.0.0"
+                    apksigner_jar = build_tools / "lib" / "apksigner.jar"
+                    apksigner = build_tools / "apksigner.bat"
                     
-                    if apksigner.exists():
+                    if apksigner_jar.exists():
+                        apksigner_cmd = [str(self.config.java), *_JVM_QUICK_FLAGS, "-jar", str(apksigner_jar)]
+                    elif apksigner.exists():
+                        apksigner_cmd = [str(apksigner)]
+                    else:
+                        apksigner_cmd = None
+                    
+                    if apksigner_cmd:
                         signed_apk = temp_path / "signed.apk"
-                        cmd = [
-                            str(apksigner),
+                        cmd = apksigner_cmd + [
                             "sign",
                             "--ks", keystore_info["keystore_file"],
                             "--ks-pass", f"pass:{keystore_info['store_password']}",
@@ -1042,18 +1875,18 @@ class SplitAPKtoAPKConverter:
                             str(aligned_apk)
                         ]
                         
-                        result = subprocess.run(cmd, capture_output=True, text=True)
+                        returncode, output = _run_tool(cmd)
                         
-                        if result.returncode == 0:
+                        if returncode == 0:
                             aligned_apk = signed_apk
                             print(f"  [OK] 签名成功")
                         else:
-                            print(f"  [!] 签名失败: {result.stderr}")
+                            print(f"  [!] 签名失败: {output}")
                     else:
                         # 使用jarsigner
                         cmd = [
                             str(self.config.jarsigner),
-                            "-verbose",
+                            *(f"-J{flag}" for flag in _JVM_QUICK_FLAGS),
                             "-sigalg", "SHA256withRSA",
                             "-digestalg", "SHA-256",
                             "-keystore", keystore_info["keystore_file"],
@@ -1063,35 +1896,43 @@ class SplitAPKtoAPKConverter:
                             keystore_info["key_alias"]
                         ]
                         
-                        result = subprocess.run(cmd, capture_output=True, text=True)
+                        returncode, output = _run_tool(cmd)
                         
-                        if result.returncode == 0:
+                        if returncode == 0:
                             print(f"  [OK] 签名成功")
                         else:
-                            print(f"  [!] 签名失败: {result.stderr}")
+                            print(f"  [!] 签名失败: {output}")
                 else:
                     print("  [!] 未找到keystore，APK未签名")
             else:
                 print("  [i] 跳过签名")
             
-            # 复制到输出路径
-            shutil.copy2(aligned_apk, output_path)
+            # 移动到输出路径（同一文件系统时直接重命名，不复制数据）
+            _move_file(aligned_apk, output_path)
         
         return True
     
+    @staticmethod
+    def _read_manifest_info(zf, manifest_name):
+        """从已打开的压缩包中读取manifest.json或info.json的包信息，失败返回None"""
+        try:
+            with zf.open(manifest_name) as fp:
+                manifest = json_loads(fp.read())
+            
+            return {
+                "package_name": manifest.get("package_name", manifest.get("packageName", "")),
+                "version_code": str(manifest.get("version_code", manifest.get("versionCode", ""))),
+                "version_name": manifest.get("version_name", manifest.get("versionName", "")),
+                "name": manifest.get("name", manifest.get("app_name", ""))
+            }
+        except:
+            return None
+    
     def get_package_info_from_manifest(self, archive_path, manifest_name):
         """从manifest.json或info.json获取包信息"""
         try:
             with zipfile.ZipFile(archive_path, 'r') as zf:
-                manifest_data = zf.read(manifest_name)
-                manifest = json.loads(manifest_data.decode('utf-8'))
-                
-                return {
-                    "package_name": manifest.get("package_name", manifest.get("packageName", "")),
-                    "version_code": str(manifest.get("version_code", manifest.get("versionCode", ""))),
-                    "version_name": manifest.get("version_name", manifest.get("versionName", "")),
-                    "name": manifest.get("name", manifest.get("app_name", ""))
-                }
+                return self._read_manifest_info(zf, manifest_name)
         except:
             return None
     
@@ -1140,7 +1981,7 @@ class SplitAPKtoAPKConverter:
         print(f"  [i] 发现 {len(analysis['all_apks'])} 个APK文件")
         
         if analysis["manifest"]:
-            pkg_info = self.get_package_info_from_manifest(input_path, analysis["manifest"])
+            pkg_info = analysis["package_info"]
             if pkg_info:
                 print(f"  [i] 包名: {pkg_info.get('package_name', 'N/A')}")
                 print(f"  [i] 版本: {pkg_info.get('version_name', 'N/A')}")
@@ -1156,61 +1997,72 @@ class SplitAPKtoAPKConverter:
         # 3. 确定输出路径
         output_apk = out_dir / f"{file_name}.apk"
         
-        # 如果输出文件已存在，先删除
-        if output_apk.exists():
-            output_apk.unlink()
-            print(f"  [i] 删除已存在的APK: {output_apk.name}")
-        
-        # 4. 执行转换
-        print(f"\n[3/4] 提取/合并APK...")
-        
-        success = False
-        
-        if analysis["has_universal"]:
-            # 直接提取universal APK
-            print(f"  [i] 提取: {Path(analysis['base_apk']).name}")
-            success = self.extract_universal_apk(input_path, output_apk, analysis, auto_sign)
-        elif len(analysis["all_apks"]) == 1:
-            # 只有一个APK，直接提取
-            print(f"  [i] 提取: {Path(analysis['all_apks'][0]).name}")
-            analysis["base_apk"] = analysis["all_apks"][0]
-            success = self.extract_universal_apk(input_path, output_apk, analysis, auto_sign)
-        elif analysis["base_apk"]:
-            # 有拆分APK，需要合并
-            if analysis["split_apks"]:
-                success = self.merge_split_apks(input_path, output_apk, analysis, auto_sign)
-            else:
-                # 只有base APK
+        # 同名输出（不同格式的同名输入）的转换依次进行
+        with _output_lock(output_apk):
+            # 如果输出文件已存在，先删除
+            if output_apk.exists():
+                output_apk.unlink()
+                print(f"  [i] 删除已存在的APK: {output_apk.name}")
+            
+            # 4. 执行转换
+            print(f"\n[3/4] 提取/合并APK...")
+            
+            success = False
+            
+            if analysis["has_universal"]:
+                # 直接提取universal APK
                 print(f"  [i] 提取: {Path(analysis['base_apk']).name}")
                 success = self.extract_universal_apk(input_path, output_apk, analysis, auto_sign)
-        else:
-            print(f"  [X] 无法找到可用的APK文件")
-            return None
-        
-        if not success:
-            return None
-        
-        # 5. 验证输出
-        print(f"\n[4/4] 验证输出...")
-        
-        if output_apk.exists():
-            size_mb = output_apk.stat().st_size / (1024 * 1024)
-            print(f"  [OK] APK生成成功: {output_apk.name}")
-            print(f"  [i] 文件大小: {size_mb:.2f} MB")
+            elif len(analysis["all_apks"]) == 1:
+                # 只有一个APK，直接提取
+                print(f"  [i] 提取: {Path(analysis['all_apks'][0]).name}")
+                analysis["base_apk"] = analysis["all_apks"][0]
+                success = self.extract_universal_apk(input_path, output_apk, analysis, auto_sign)
+            elif analysis["base_apk"]:
+                # 有拆分APK，需要合并
+                if analysis["split_apks"]:
+                    success = self.merge_split_apks(input_path, output_apk, analysis, auto_sign)
+                else:
+                    # 只有base APK
+                    print(f"  [i] 提取: {Path(analysis['base_apk']).name}")
+                    success = self.extract_universal_apk(input_path, output_apk, analysis, auto_sign)
+            else:
+                print(f"  [X] 无法找到可用的APK文件")
+                return None
             
-            print(f"\n[OK] 转换完成: {output_apk}")
-            return str(output_apk)
-        else:
-            print(f"  [X] APK生成失败")
-            return None
+            if not success:
+                return None
+            
+            # 5. 验证输出
+            print(f"\n[4/4] 验证输出...")
+            
+            if output_apk.exists():
+                size_mb = output_apk.stat().st_size / (1024 * 1024)
+                print(f"  [OK] APK生成成功: {output_apk.name}")
+                print(f"  [i] 文件大小: {size_mb:.2f} MB")
+            
+                print(f"\n[OK] 转换完成: {output_apk}")
+                return str(output_apk)
+            else:
+                print(f"  [X] APK生成失败")
+                return None
+
+
+def _convert_split_file(converter, file_path):
+    """批量转换APKS/XAPK/APKM时的单个任务（在线程池中运行），返回是否成功"""
+    try:
+        return bool(converter.convert(file_path))
+    except Exception as e:
+        print(f"[X] 转换失败 {file_path.name}: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
 
 
 def batch_convert_split_to_apk(config):
     """批量转换APKS/XAPK/APKM到APK"""
     # 获取所有支持的文件
-    all_files = []
-    for ext in SplitAPKtoAPKConverter.SUPPORTED_EXTENSIONS:
-        all_files.extend(config.split_apk_dir.glob(f"*{ext}"))
+    all_files = _scan_dir(config.split_apk_dir, SplitAPKtoAPKConverter.SUPPORTED_SUFFIXES)
     
     if not all_files:
         print(f"[X] split_apk目录下没有找到APKS/XAPK/APKM文件")
@@ -1232,20 +2084,19 @@ def batch_convert_split_to_apk(config):
         "failed": []
     }
     
-    for i, file_path in enumerate(all_files, 1):
-        print(f"\n[{i}/{len(all_files)}] 处理: {file_path.name}")
-        
-        try:
-            result = converter.convert(file_path)
-            if result:
+    # 两个文件交替进行：一个在合并（磁盘IO）时，另一个可以在签名（JVM）
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {
+            pool.submit(_convert_split_file, converter, file_path): file_path
+            for file_path in all_files
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            file_path = futures[future]
+            if future.result():
                 results["success"].append(file_path.name)
             else:
                 results["failed"].append(file_path.name)
-        except Exception as e:
-            print(f"[X] 转换失败: {e}")
-            import traceback
-            traceback.print_exc()
-            results["failed"].append(file_path.name)
+            print(f"\n[{i}/{len(all_files)}] 完成: {file_path.name}")
     
     # 打印结果摘要
     print("\n" + "="*60)
@@ -1266,7 +2117,7 @@ def batch_convert_split_to_apk(config):
 def batch_convert_aab_to_apks(config, mode="default", all_modes=False):
     """批量转换AAB到APKS"""
     # 获取所有AAB文件
-    aab_files = list(config.aab_dir.glob("*.aab"))
+    aab_files = _scan_dir(config.aab_dir, {'.aab'})
     
     if not aab_files:
         print("[X] aab目录下没有找到AAB文件")
@@ -1331,7 +2182,7 @@ def batch_convert_aab_to_apks(config, mode="default", all_modes=False):
 def batch_convert_apk_to_aab(config):
     """批量转换APK到AAB"""
     # 获取所有APK文件
-    apk_files = list(config.apk_dir.glob("*.apk"))
+    apk_files = _scan_dir(config.apk_dir, {'.apk'})
     
     if not apk_files:
         print("[X] apk目录下没有找到APK文件")
@@ -1345,26 +2196,18 @@ def batch_convert_apk_to_aab(config):
     print("开始批量转换...")
     print("="*60)
     
-    converter = APKtoAABConverter(config)
-    
     results = {
         "success": [],
         "failed": []
     }
     
-    for i, apk_file in enumerate(apk_files, 1):
-        print(f"\n[{i}/{len(apk_files)}] 处理: {apk_file.name}")
-        
-        try:
-            result = converter.convert(apk_file, auto_sign=True)
-            if result:
-                results["success"].append(apk_file.name)
-            else:
-                results["failed"].append(apk_file.name)
-        except Exception as e:
-            print(f"[X] 转换失败: {e}")
-            import traceback
-            traceback.print_exc()
+    # 各APK相互独立，使用进程池并发转换
+    batch_results = convert_batch(config, apk_files, auto_sign=True)
+    
+    for apk_file in apk_files:
+        if batch_results.get(str(apk_file)):
+            results["success"].append(apk_file.name)
+        else:
             results["failed"].append(apk_file.name)
     
     # 打印结果摘要
@@ -1442,36 +2285,25 @@ def main():
         print("\n请确保所有必要的工具都已安装")
         sys.exit(1)
     
+    # 首次运行（或bundletool.jar更新后）生成bundletool的类数据共享归档
+    prepare_bundletool_archive(config)
+    
     # 检查并创建目录
     print("\n[*] 检查目录...")
-    for dir_name, dir_path in [
-        ("apk", config.apk_dir),
-        ("aab", config.aab_dir),
-        ("apks", config.apks_dir),
-        ("split_apk", config.split_apk_dir),
-        ("apk2", config.apk2_dir),
-        ("keystore", config.keystore_dir)
+    for dir_name, dir_path, suffixes in [
+        ("apk", config.apk_dir, {'.apk'}),
+        ("aab", config.aab_dir, {'.aab'}),
+        ("apks", config.apks_dir, {'.apks'}),
+        ("split_apk", config.split_apk_dir, SplitAPKtoAPKConverter.SUPPORTED_SUFFIXES),
+        ("apk2", config.apk2_dir, {'.apk'}),
+        ("keystore", config.keystore_dir, {'.jks'})
     ]:
         if not dir_path.exists():
             dir_path.mkdir(parents=True)
             print(f"   创建目录: {dir_name}/")
         else:
-            # 统计文件数量
-            if dir_name == "apk":
-                count = len(list(dir_path.glob("*.apk")))
-            elif dir_name == "aab":
-                count = len(list(dir_path.glob("*.aab")))
-            elif dir_name == "apks":
-                count = len(list(dir_path.glob("*.apks")))
-            elif dir_name == "split_apk":
-                count = sum(len(list(dir_path.glob(f"*{ext}"))) 
-                           for ext in ['.apks', '.xapk', '.apkm'])
-            elif dir_name == "apk2":
-                count = len(list(dir_path.glob("*.apk")))
-            elif dir_name == "keystore":
-                count = len(list(dir_path.glob("*.jks")))
-            else:
-                count = 0
+            # 统计文件数量（每个目录只扫描一次，只计数不构建路径列表）
+            count = _count_dir(dir_path, suffixes)
             print(f"   [OK] {dir_name}/ ({count} 个文件)")
     
     # 检查命令行参数
@@ -1536,4 +2368,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 批量转换使用进程池，打包为exe后子进程需要这一步
+    multiprocessing.freeze_support()
     main()
@@ -12,12 +12,21 @@ Telegram频道: https://t.me/webjsp
 
 import os
 import sys
+import asyncio
+import re
+import subprocess
+import zipfile
 import threading
-import queue
+import functools
+import itertools
+import multiprocessing
+import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, ttk
 from pathlib import Path
-from datetime import datetime
 
 # 尝试导入 customtkinter，如果没有则使用 tkinter
 try:
@@ -34,10 +43,339 @@ from converter import (
     APKtoAABConverter, 
     AABtoAPKSConverter, 
     SplitAPKtoAPKConverter,
-    RandomSignatureGenerator
+    RandomSignatureGenerator,
+    convert_batch_async,
+    terminate_running_tools,
+    warm_bundletool,
+    json_loads
 )
 
 
+# 顶部联系方式按钮: (文字, 背景色, 悬停色, 链接)
+CONTACT_LINKS = (
+    ("💬 Telegram联系: t.me/webasp", "#0088cc", "#006699", "https://t.me/webasp"),
+    ("📢 Telegram频道: t.me/webjsp", "#0088cc", "#006699", "https://t.me/webjsp"),
+    ("🐙 GitHub: planspieldaxe-commits", "#24292e", "#1a1e22", "https://github.com/planspieldaxe-commits"),
+)
+
+# AAB → APKS 标签页的转换模式: (说明, 模式)
+AAB2APKS_MODES = (
+    ("default - 拆分APK（Google Play标准）", "default"),
+    ("universal - 通用单APK（推荐侧载）", "universal"),
+    ("system - 系统预装APK", "system"),
+    ("instant - 即时应用", "instant"),
+)
+
+# 全流程转换可选的APKS输出模式
+APKS_MODE_VALUES = ("default", "universal", "system", "instant")
+
+# 各输入的文件选择对话框过滤器
+APK_FILETYPES = [("APK文件", "*.apk")]
+AAB_FILETYPES = [("AAB文件", "*.aab")]
+SPLIT_FILETYPES = [("拆分包", "*.apks *.xapk *.apkm"),
+                   ("APKS", "*.apks"),
+                   ("XAPK", "*.xapk"),
+                   ("APKM", "*.apkm")]
+
+# 解析 aapt2 dump badging 输出用的正则（只用于 package: 行）
+_PKG_RE = re.compile(r"package: name='([^']+)'")
+_VERSION_NAME_RE = re.compile(r"versionName='([^']+)'")
+_VERSION_CODE_RE = re.compile(r"versionCode='([^']+)'")
+
+# aapt2 dump badging 中单值行的前缀 -> 字段名
+_BADGING_LINE_FIELDS = (
+    ("sdkVersion:'", "sdk"),
+    ("targetSdkVersion:'", "target_sdk"),
+    ("application-label:'", "label"),
+)
+
+
+def _parse_badging_line(line, info):
+    """解析 aapt2 dump badging 的一行，把识别到的字段写入info（已有的字段不覆盖）
+    
+    badging输出每行只有一类信息，按行首前缀分派即可，不需要对整个输出逐个正则搜索。
+    """
+    if line.startswith("package:"):
+        for key, pattern in (("package", _PKG_RE),
+                             ("version_name", _VERSION_NAME_RE),
+                             ("version_code", _VERSION_CODE_RE)):
+            match = pattern.search(line)
+            if match and key not in info:
+                info[key] = match.group(1)
+        return
+    
+    for prefix, key in _BADGING_LINE_FIELDS:
+        if line.startswith(prefix):
+            value = line[len(prefix):].rstrip()
+            if value.endswith("'"):
+                value = value[:-1]
+            info.setdefault(key, value)
+            return
+
+
+@functools.lru_cache(maxsize=128)
+def _aab_content_lines(aab_path, mtime_ns, size):
+    """分析AAB内容（模块、原生库架构、资源），返回信息行；按 (路径, 修改时间, 大小) 缓存"""
+    lines = []
+    try:
+        with zipfile.ZipFile(aab_path, 'r') as zf:
+            # infolist直接返回已解析的中央目录，不像namelist那样再复制一份名称列表
+            entries = zf.infolist()
+    except (OSError, zipfile.BadZipFile):
+        return ()
+    
+    # 一次遍历统计模块、原生库架构、资源
+    modules = set()
+    archs = set()
+    has_native = has_res = has_assets = False
+    for entry in entries:
+        name = entry.filename
+        if '/' in name:
+            module = name.split('/', 1)[0]
+            if module not in ('META-INF', 'BUNDLE-METADATA'):
+                modules.add(module)
+        
+        if name.startswith('base/res/'):
+            has_res = True
+        elif name.startswith('base/assets/'):
+            has_assets = True
+        
+        if 'lib/' in name and name.endswith('.so'):
+            has_native = True
+            parts = name.split('/')
+            for i, p in enumerate(parts):
+                if p == 'lib' and i + 1 < len(parts):
+                    archs.add(parts[i + 1])
+    
+    if modules:
+        lines.append(f"📦 模块: {', '.join(sorted(modules))}")
+    
+    if archs:
+        lines.append(f"🔧 原生库架构: {', '.join(sorted(archs))}")
+    
+    features = []
+    if has_res:
+        features.append("资源文件")
+    if has_assets:
+        features.append("Assets")
+    if has_native:
+        features.append("原生库")
+    
+    if features:
+        lines.append(f"📂 包含: {', '.join(features)}")
+    
+    return tuple(lines)
+
+
+@functools.lru_cache(maxsize=128)
+def _split_content_lines(archive_path, mtime_ns, size):
+    """分析拆分包内容（APK类型、包信息、OBB），返回信息行；按 (路径, 修改时间, 大小) 缓存"""
+    lines = []
+    try:
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            # 一次遍历中央目录统计APK类型、OBB文件和manifest
+            apk_count = obb_count = split_config_count = 0
+            has_universal = has_base = False
+            manifest_names = set()
+            for entry in zf.infolist():
+                n = entry.filename
+                if n.endswith('.apk'):
+                    apk_count += 1
+                    lower = n.lower()
+                    if 'universal' in lower or 'standalone' in lower:
+                        has_universal = True
+                    if 'base' in lower:
+                        has_base = True
+                    if 'split_config' in lower or 'config.' in lower:
+                        split_config_count += 1
+                elif n.endswith('.obb'):
+                    obb_count += 1
+                elif n in ('manifest.json', 'info.json'):
+                    manifest_names.add(n)
+            
+            lines.append(f"📱 APK数量: {apk_count} 个")
+            
+            # 尝试获取包信息
+            for manifest_name in ['manifest.json', 'info.json']:
+                if manifest_name in manifest_names:
+                    try:
+                        manifest_data = zf.read(manifest_name)
+                        manifest = json_loads(manifest_data)
+                        
+                        pkg_name = manifest.get('package_name', manifest.get('packageName', ''))
+                        version_name = manifest.get('version_name', manifest.get('versionName', ''))
+                        version_code = manifest.get('version_code', manifest.get('versionCode', ''))
+                        
+                        if pkg_name:
+                            lines.append(f"📛 包名: {pkg_name}")
+                        if version_name:
+                            lines.append(f"🏷️ 版本: {version_name} ({version_code})")
+                        break
+                    except:
+                        pass
+            
+            # APK类型
+            if has_universal:
+                lines.append(f"✅ 类型: Universal/Standalone APK（可直接提取）")
+            elif has_base and split_config_count:
+                lines.append(f"🔧 类型: 拆分APK（需要合并）")
+                lines.append(f"   - 基础APK + {split_config_count} 个配置APK")
+            elif apk_count == 1:
+                lines.append(f"✅ 类型: 单一APK（可直接提取）")
+            else:
+                lines.append(f"🔧 类型: 多APK文件")
+            
+            # OBB文件
+            if obb_count:
+                lines.append(f"⚠️ OBB文件: {obb_count} 个（将被忽略）")
+                
+    except zipfile.BadZipFile:
+        lines.append("⚠️ 无法读取压缩包内容")
+    
+    return tuple(lines)
+
+
+def _scan_entries(folder, suffixes):
+    """列出目录下扩展名（不区分大小写）在suffixes中的文件
+    
+    返回os.DirEntry列表，entry.stat()在Windows上直接使用遍历目录时得到的信息，不再逐个调用stat。
+    """
+    with os.scandir(folder) as it:
+        return [entry for entry in it
+                if os.path.splitext(entry.name)[1].lower() in suffixes and entry.is_file()]
+
+
+# 文件数超过该值时并行stat（网络驱动器上每次stat都有往返延迟）
+_PARALLEL_STAT_MIN = 32
+
+
+def _entry_size(entry):
+    return entry.stat().st_size
+
+
+def _total_size(entries):
+    """计算_scan_entries返回的文件总大小，文件较多时用线程池并行stat"""
+    if len(entries) < _PARALLEL_STAT_MIN:
+        return sum(map(_entry_size, entries))
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return sum(ex.map(_entry_size, entries))
+
+
+def _is_up_to_date(output, source_mtime_ns):
+    """输出文件存在且不比源文件旧时返回True（用于跳过已完成的转换）"""
+    try:
+        return output.stat().st_mtime_ns >= source_mtime_ns
+    except OSError:
+        return False
+
+
+def _preview_lines(entries):
+    """文件夹信息中的文件名预览：不超过5个时全部列出，否则列出前3个并注明剩余数量"""
+    total = len(entries)
+    shown = total if total <= 5 else 3
+    lines = [f"   - {f.name}" for f in itertools.islice(entries, shown)]
+    if shown < total:
+        lines.append(f"   ... 还有 {total - shown} 个文件")
+    return lines
+
+
+# 各信息面板需要的badging字段，全部读到后即可结束aapt2
+_APK_INFO_FIELDS = frozenset({"package", "version_name", "version_code", "sdk", "target_sdk", "label"})
+_FULL_INFO_FIELDS = frozenset({"package", "version_name", "label"})
+
+
+def _read_badging(aapt2, apk_path, fields, timeout=10):
+    """运行 aapt2 dump badging 并逐行解析输出
+    
+    fields中的字段都拿到后立即结束aapt2，不再等待后面大量的权限/特性行。
+    返回字段字典；aapt2执行失败且没有解析到所需字段时返回None。
+    """
+    cmd = [str(aapt2), "dump", "badging", str(apk_path)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding="utf-8", errors="replace", bufsize=65536)
+    # 超时仍未结束则强制终止
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    
+    info = {}
+    try:
+        for line in proc.stdout:
+            _parse_badging_line(line, info)
+            if fields.issubset(info):
+                proc.kill()
+                return info
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        returncode = proc.wait()
+    
+    return info if returncode == 0 else None
+
+
+class _BadgingFailed(Exception):
+    """aapt2读取badging失败（超时或出错）"""
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_badging_ok(aapt2, apk_path, mtime_ns, size, fields):
+    """只缓存成功的结果：失败时抛出异常，lru_cache不会记录抛出异常的调用"""
+    info = _read_badging(aapt2, apk_path, fields)
+    if info is None:
+        raise _BadgingFailed(apk_path)
+    return info
+
+
+def _cached_badging(aapt2, apk_path, mtime_ns, size, fields):
+    """按 (路径, 修改时间, 大小) 缓存badging结果，重新选择同一个未修改的APK时不再启动aapt2
+    
+    读取失败返回None且不缓存（一次超时不会让这个APK在本次运行中一直没有信息）。
+    """
+    try:
+        return _cached_badging_ok(aapt2, apk_path, mtime_ns, size, fields)
+    except _BadgingFailed:
+        return None
+
+
+def _shutdown_now(executor):
+    """关闭线程池：丢弃排队中的任务，不等待正在执行的任务"""
+    try:
+        executor.shutdown(wait=False, cancel_futures=True)
+    except TypeError:
+        # Python 3.8 没有cancel_futures参数
+        executor.shutdown(wait=False)
+
+
+class LogNotifier:
+    """通知GUI线程有新日志（可在多个工作线程中同时调用）
+    
+    上一次发送的 <<LogAvailable>> 事件被处理（clear）之前不再重复发送，
+    连续输出会合并为一次刷新。是否已发送由加锁的标志判断，
+    多个线程同时写日志时也不会漏发或重复发送。
+    when="tail" 把事件排到Tk事件队列末尾，可以在工作线程中调用。
+    """
+    
+    def __init__(self, widget):
+        self.widget = widget
+        self._lock = threading.Lock()
+        self._pending = False
+    
+    def notify(self):
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+        try:
+            self.widget.event_generate("<<LogAvailable>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # 窗口已关闭：后台任务结束前的输出直接丢弃
+            pass
+    
+    def clear(self):
+        """刷新开始时调用：之后写入的日志会重新发送事件"""
+        with self._lock:
+            self._pending = False
+
+
 class LogRedirector:
     """重定向print输出到GUI日志"""
     def __init__(self, text_widget, log_queue):
@@ -46,8 +384,8 @@ class LogRedirector:
         
     def write(self, message):
         if message.strip():
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log_queue.put(f"[{timestamp}] {message}")
+            timestamp = time.strftime("%H:%M:%S")
+            self.log_queue.append(f"[{timestamp}] {message}")
     
     def flush(self):
         pass
@@ -56,19 +394,37 @@ class LogRedirector:
 class ConverterGUI:
     """主GUI应用程序"""
     
+    # 日志文本框保留的最大行数
+    LOG_MAX_LINES = 5000
+    
     def __init__(self):
         # 初始化配置
         self.base_dir = Path(__file__).parent
         self.config = Config(self.base_dir)
         
-        # 日志队列
-        self.log_queue = queue.Queue()
+        # 日志队列（deque的append/popleft本身是线程安全的，不需要Queue的锁和条件变量）
+        # 限制长度：界面来不及刷新时自动丢弃最旧的消息，反正文本框也只保留最近LOG_MAX_LINES行
+        self.log_queue = deque(maxlen=self.LOG_MAX_LINES)
+        # 进度状态 [已完成数, 总数, 起始值, 跨度]：工作线程只在锁内修改计数，
+        # 进度条由GUI线程在刷新日志时按 起始值 + 跨度 * 已完成数 / 总数 设置一次
+        self._progress_lock = threading.Lock()
+        self._progress = [0, 0, 0.0, 0.0]
+        self._progress_shown = None
         
         # 创建主窗口
         if CTK_AVAILABLE:
             ctk.set_appearance_mode("dark")
             ctk.set_default_color_theme("blue")
             self.root = ctk.CTk()
+            # 界面中用到的字体只创建一次，各控件共用同一个字体对象
+            self._fonts = {
+                "n12": ctk.CTkFont(size=12),
+                "n13": ctk.CTkFont(size=13),
+                "bold14": ctk.CTkFont(size=14, weight="bold"),
+                "bold16": ctk.CTkFont(size=16, weight="bold"),
+                "bold18": ctk.CTkFont(size=18, weight="bold"),
+                "bold20": ctk.CTkFont(size=20, weight="bold"),
+            }
         else:
             self.root = tk.Tk()
         
@@ -76,6 +432,55 @@ class ConverterGUI:
         self.root.geometry("800x650")
         self.root.minsize(700, 550)
         
+        # 日志刷新事件的发送标志（多个工作线程写日志时只发送一次事件）
+        self._log_notifier = LogNotifier(self.root)
+        
+        # 转换任务、工具预热等的后台线程池
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="conv")
+        
+        # 文件信息读取单独使用的线程池（转换或工具预热占满_pool时仍可立即查看文件信息）
+        self._info_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="info")
+        # 各信息面板最近一次读取的序号: {set_info: 序号}，旧的读取结果不再显示
+        self._info_generation = {}
+        # 信息读取线程中当前任务的 (set_info, 序号)
+        self._info_local = threading.local()
+        
+        # 所有转换任务共用的JVM名额（bundletool/jarsigner），见BATCH_WORKERS
+        self._jvm_slots = threading.Semaphore(self.BATCH_WORKERS)
+        
+        # 点击"停止"或关闭窗口后设置，批量转换不再开始新的文件
+        self._cancel = threading.Event()
+        
+        # 各转换器实例（首次使用时创建，之后的转换任务共用）
+        self._converters = {}
+        
+        # 批量APK转换使用的后台事件循环（首次批量转换时才创建），以及正在其中运行的批量转换
+        self._loop = None
+        self._loop_futures = set()
+        
+        # keystore目录列表缓存: (目录修改时间, (文件名集合, 文件列表))
+        self._keystore_cache = (None, None)
+        
+        # 批量转换输入目录的列表缓存: {(目录, 扩展名): (缓存时间, 目录修改时间, 文件列表)}
+        self._listing_cache = {}
+        
+        # 输入路径是否存在的检查结果缓存: {路径: (检查时间, 是否存在)}
+        self._path_exists_cache = {}
+        
+        # 各信息标签当前显示的文本
+        self._label_cache = {}
+        
+        # 已创建的开始按钮及其当前状态（标签页是按需构建的）
+        self._start_buttons = []
+        self._buttons_state = "normal"
+        
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # 先让空窗口显示出来，其余初始化放到事件循环空闲时执行
+        self.root.after_idle(self._late_init)
+    
+    def _late_init(self):
+        """窗口首次显示后再执行的初始化（图标、界面构建、工具检查）"""
         # 设置图标（如果存在）
         icon_path = self.base_dir / "icon.ico"
         if icon_path.exists():
@@ -84,11 +489,14 @@ class ConverterGUI:
         # 构建界面
         self.setup_ui()
         
-        # 启动日志更新
-        self.update_log()
+        # 有新日志时由 <<LogAvailable>> 事件触发刷新，空闲时不再定时唤醒
+        self.root.bind("<<LogAvailable>>", self.drain_log)
+        # 窗口最小化期间日志只留在队列中，恢复显示时再一次性插入
+        self.root.bind("<Map>", self._on_map)
+        self.drain_log()
         
-        # 检查工具
-        self.check_tools()
+        # 检查工具（会启动外部进程，放到界面构建完成之后）
+        self.root.after(10, self.check_tools)
     
     def setup_ui(self):
         """构建用户界面"""
@@ -115,97 +523,38 @@ class ConverterGUI:
         """创建顶部联系方式栏"""
         if CTK_AVAILABLE:
             contact_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-            contact_frame.pack(fill="x", padx=5, pady=(0, 5))
-            
-            # 左侧标题
             ctk.CTkLabel(contact_frame, text="📱 联系方式:", 
-                        font=ctk.CTkFont(size=13)).pack(side="left", padx=5)
-            
-            # Telegram联系按钮
-            btn_contact = ctk.CTkButton(
-                contact_frame, 
-                text="💬 Telegram联系: t.me/webasp",
-                width=220,
-                height=28,
-                font=ctk.CTkFont(size=12),
-                fg_color="#0088cc",
-                hover_color="#006699",
-                command=lambda: self.open_link("https://t.me/webasp")
-            )
-            btn_contact.pack(side="left", padx=5)
-            
-            # Telegram频道按钮
-            btn_channel = ctk.CTkButton(
-                contact_frame, 
-                text="📢 Telegram频道: t.me/webjsp",
-                width=220,
-                height=28,
-                font=ctk.CTkFont(size=12),
-                fg_color="#0088cc",
-                hover_color="#006699",
-                command=lambda: self.open_link("https://t.me/webjsp")
-            )
-            btn_channel.pack(side="left", padx=5)
-            
-            # GitHub按钮
-            btn_github = ctk.CTkButton(
-                contact_frame, 
-                text="🐙 GitHub: planspieldaxe-commits",
-                width=220,
-                height=28,
-                font=ctk.CTkFont(size=12),
-                fg_color="#24292e",
-                hover_color="#1a1e22",
-                command=lambda: self.open_link("https://github.com/planspieldaxe-commits")
-            )
-            btn_github.pack(side="left", padx=5)
-            
+                        font=self._fonts["n13"]).pack(side="left", padx=5)
         else:
             contact_frame = tk.Frame(self.main_frame)
-            contact_frame.pack(fill="x", padx=5, pady=(0, 5))
-            
             tk.Label(contact_frame, text="📱 联系方式:").pack(side="left", padx=5)
-            
-            btn_contact = tk.Button(
-                contact_frame,
-                text="💬 Telegram联系: t.me/webasp",
-                bg="#0088cc",
-                fg="white",
-                activebackground="#006699",
-                activeforeground="white",
-                cursor="hand2",
-                command=lambda: self.open_link("https://t.me/webasp")
-            )
-            btn_contact.pack(side="left", padx=5)
-            
-            btn_channel = tk.Button(
-                contact_frame,
-                text="📢 Telegram频道: t.me/webjsp",
-                bg="#0088cc",
-                fg="white",
-                activebackground="#006699",
-                activeforeground="white",
-                cursor="hand2",
-                command=lambda: self.open_link("https://t.me/webjsp")
-            )
-            btn_channel.pack(side="left", padx=5)
-            
-            btn_github = tk.Button(
-                contact_frame,
-                text="🐙 GitHub: planspieldaxe-commits",
-                bg="#24292e",
-                fg="white",
-                activebackground="#1a1e22",
-                activeforeground="white",
-                cursor="hand2",
-                command=lambda: self.open_link("https://github.com/planspieldaxe-commits")
-            )
-            btn_github.pack(side="left", padx=5)
-    
-    def open_link(self, url):
-        """打开链接"""
-        import webbrowser
-        webbrowser.open(url)
+        contact_frame.pack(fill="x", padx=5, pady=(0, 5))
+        
+        for text, color, hover_color, url in CONTACT_LINKS:
+            open_url = functools.partial(webbrowser.open, url)
+            if CTK_AVAILABLE:
+                button = ctk.CTkButton(
+                    contact_frame,
+                    text=text,
+                    width=220,
+                    height=28,
+                    font=self._fonts["n12"],
+                    fg_color=color,
+                    hover_color=hover_color,
+                    command=open_url
+                )
+            else:
+                button = tk.Button(
+                    contact_frame,
+                    text=text,
+                    bg=color,
+                    fg="white",
+                    activebackground=hover_color,
+                    activeforeground="white",
+                    cursor="hand2",
+                    command=open_url
+                )
+            button.pack(side="left", padx=5)
     
     def create_tabview(self):
         """创建标签页视图"""
@@ -220,7 +569,6 @@ class ConverterGUI:
             self.tab_split2apk = self.tabview.add("拆分包 → APK")
         else:
             # 使用ttk.Notebook
-            from tkinter import ttk
             self.tabview = ttk.Notebook(self.main_frame)
             self.tabview.pack(fill="both", expand=True, padx=5, pady=5)
             
@@ -234,508 +582,226 @@ class ConverterGUI:
             self.tabview.add(self.tab_full, text="全流程转换")
             self.tabview.add(self.tab_split2apk, text="拆分包 → APK")
         
-        # 填充各标签页内容
-        self.setup_tab_apk2aab()
-        self.setup_tab_aab2apks()
-        self.setup_tab_full()
-        self.setup_tab_split2apk()
+        # 标签页内容在第一次切换到该页时才构建
+        self._tab_builders = {
+            self.tab_apk2aab: self.setup_tab_apk2aab,
+            self.tab_aab2apks: self.setup_tab_aab2apks,
+            self.tab_full: self.setup_tab_full,
+            self.tab_split2apk: self.setup_tab_split2apk,
+        }
+        self._built_tabs = set()
+        if CTK_AVAILABLE:
+            self.tabview.configure(command=self._on_tab_change)
+        else:
+            self.tabview.bind("<<NotebookTabChanged>>", self._on_tab_change)
+        
+        # 只构建默认显示的标签页
+        self._on_tab_change()
+    
+    def _on_tab_change(self, event=None):
+        """切换标签页时构建尚未创建的页面内容"""
+        if CTK_AVAILABLE:
+            tab = self.tabview.tab(self.tabview.get())
+        else:
+            tab = self.tabview.nametowidget(self.tabview.select())
+        
+        if tab in self._built_tabs:
+            return
+        self._built_tabs.add(tab)
+        self._tab_builders[tab]()
+    
+    # ==================== 标签页控件构建 ====================
+    
+    def _section(self, tab, title):
+        """创建带标题的分组，返回放置内容的容器（tk版本直接放在标签页上）"""
+        if CTK_AVAILABLE:
+            frame = ctk.CTkFrame(tab)
+            frame.pack(fill="x", padx=10, pady=10)
+            ctk.CTkLabel(frame, text=title, 
+                        font=self._fonts["bold14"]).pack(anchor="w", padx=5, pady=5)
+            return frame
+        
+        tk.Label(tab, text=title, font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
+        return tab
+    
+    def _button(self, parent, text, command):
+        """创建普通按钮"""
+        if CTK_AVAILABLE:
+            return ctk.CTkButton(parent, text=text, width=100, command=command)
+        return tk.Button(parent, text=text, command=command)
+    
+    def _path_row(self, tab, title, placeholder=None, default=None):
+        """创建"标题 + 路径输入框"一行，返回 (行容器, 输入框)，浏览按钮由调用方添加"""
+        parent = self._section(tab, title)
+        if CTK_AVAILABLE:
+            row = ctk.CTkFrame(parent, fg_color="transparent")
+            row.pack(fill="x", padx=5, pady=5)
+            entry = ctk.CTkEntry(row, width=500, placeholder_text=placeholder)
+        else:
+            row = tk.Frame(parent)
+            row.pack(fill="x", padx=10, pady=5)
+            entry = tk.Entry(row, width=60)
+        
+        if default:
+            entry.insert(0, default)
+        entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        return row, entry
+    
+    def _input_row(self, tab, title, placeholder, browse_file, browse_folder):
+        """创建输入文件/文件夹选择行，返回输入框"""
+        row, entry = self._path_row(tab, title, placeholder=placeholder)
+        self._button(row, "浏览文件", browse_file).pack(side="left", padx=2)
+        self._button(row, "浏览文件夹", browse_folder).pack(side="left", padx=2)
+        # 手动输入路径后离开输入框时就在后台检查路径，点击开始转换时直接使用检查结果
+        entry.bind("<FocusOut>", lambda event: self._pool.submit(self._path_exists, entry.get().strip()))
+        return entry
+    
+    def _output_row(self, tab, title, default):
+        """创建输出目录选择行，返回输入框"""
+        row, entry = self._path_row(tab, title, default=default)
+        self._button(row, "浏览", lambda: self.browse_folder(entry)).pack(side="left")
+        return entry
+    
+    def _info_label(self, tab):
+        """创建文件信息显示标签"""
+        if CTK_AVAILABLE:
+            frame = self._section(tab, "📋 文件信息:")
+            label = ctk.CTkLabel(frame, text="选择文件后显示信息...", justify="left")
+            label.pack(anchor="w", padx=20, pady=5)
+        else:
+            label = tk.Label(tab, text="选择文件后显示信息...", justify="left")
+            label.pack(anchor="w", padx=20, pady=10)
+        return label
+    
+    def _sign_option(self, tab, text):
+        """创建签名选项（默认勾选），返回ctk复选框或tk的BooleanVar，两者的get()都可直接转为bool"""
+        if CTK_AVAILABLE:
+            frame = self._section(tab, "🔐 签名设置:")
+            checkbox = ctk.CTkCheckBox(frame, text=text)
+            checkbox.select()
+            checkbox.pack(anchor="w", padx=20, pady=5)
+            return checkbox
+        
+        var = tk.BooleanVar(value=True)
+        tk.Checkbutton(tab, text=text, variable=var).pack(anchor="w", padx=20, pady=10)
+        return var
+    
+    def _start_button(self, tab, text, command, size=16, height=40, pady=20):
+        """创建开始转换按钮"""
+        if CTK_AVAILABLE:
+            button = ctk.CTkButton(tab, text=text, height=height,
+                                   font=self._fonts[f"bold{size}"],
+                                   command=command)
+        else:
+            button = tk.Button(tab, text=text, font=("", 14, "bold"), command=command)
+        button.pack(pady=pady)
+        
+        # 转换进行中才构建的页面，按钮也要保持禁用
+        button.configure(state=self._buttons_state)
+        self._start_buttons.append(button)
+        return button
+    
+    def _error_label(self, tab):
+        """创建开始按钮下方的输入错误提示标签（平时为空）"""
+        if CTK_AVAILABLE:
+            label = ctk.CTkLabel(tab, text="", text_color="red", height=20)
+        else:
+            label = tk.Label(tab, text="", fg="red")
+        label.pack(pady=(0, 5))
+        return label
     
     def setup_tab_apk2aab(self):
         """设置 APK → AAB 标签页"""
         tab = self.tab_apk2aab
         
-        # 输入文件
-        if CTK_AVAILABLE:
-            frame_input = ctk.CTkFrame(tab)
-            frame_input.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_input, text="📂 输入APK文件/文件夹:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            input_row = ctk.CTkFrame(frame_input, fg_color="transparent")
-            input_row.pack(fill="x", padx=5, pady=5)
-            
-            self.apk2aab_input = ctk.CTkEntry(input_row, width=500, placeholder_text="选择APK文件或apk文件夹...")
-            self.apk2aab_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(input_row, text="浏览文件", width=100,
-                         command=self.browse_apk_file).pack(side="left", padx=2)
-            ctk.CTkButton(input_row, text="浏览文件夹", width=100,
-                         command=self.browse_apk_folder).pack(side="left", padx=2)
-            
-            # 文件信息显示
-            self.apk_info_frame = ctk.CTkFrame(tab)
-            self.apk_info_frame.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(self.apk_info_frame, text="📋 文件信息:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.apk_info_label = ctk.CTkLabel(self.apk_info_frame, 
-                                              text="选择文件后显示信息...",
-                                              justify="left")
-            self.apk_info_label.pack(anchor="w", padx=20, pady=5)
-            
-            # 输出目录
-            frame_output = ctk.CTkFrame(tab)
-            frame_output.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_output, text="📁 输出目录:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            output_row = ctk.CTkFrame(frame_output, fg_color="transparent")
-            output_row.pack(fill="x", padx=5, pady=5)
-            
-            self.apk2aab_output = ctk.CTkEntry(output_row, width=500)
-            self.apk2aab_output.insert(0, str(self.config.aab_dir))
-            self.apk2aab_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(output_row, text="浏览", width=100,
-                         command=lambda: self.browse_folder(self.apk2aab_output)).pack(side="left")
-            
-            # 签名选项
-            frame_sign = ctk.CTkFrame(tab)
-            frame_sign.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_sign, text="🔐 签名设置:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.apk2aab_auto_sign = ctk.CTkCheckBox(frame_sign, text="自动生成随机签名（推荐）")
-            self.apk2aab_auto_sign.select()
-            self.apk2aab_auto_sign.pack(anchor="w", padx=20, pady=5)
-            
-            # 转换按钮
-            self.btn_apk2aab = ctk.CTkButton(tab, text="🚀 开始转换", height=40,
-                                            font=ctk.CTkFont(size=16, weight="bold"),
-                                            command=self.run_apk2aab)
-            self.btn_apk2aab.pack(pady=20)
-            
-        else:
-            # Tkinter 版本
-            tk.Label(tab, text="📂 输入APK文件/文件夹:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            input_row = tk.Frame(tab)
-            input_row.pack(fill="x", padx=10, pady=5)
-            
-            self.apk2aab_input = tk.Entry(input_row, width=60)
-            self.apk2aab_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(input_row, text="浏览文件", 
-                     command=self.browse_apk_file).pack(side="left", padx=2)
-            tk.Button(input_row, text="浏览文件夹",
-                     command=self.browse_apk_folder).pack(side="left", padx=2)
-            
-            self.apk_info_label = tk.Label(tab, text="选择文件后显示信息...", justify="left")
-            self.apk_info_label.pack(anchor="w", padx=20, pady=10)
-            
-            tk.Label(tab, text="📁 输出目录:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            output_row = tk.Frame(tab)
-            output_row.pack(fill="x", padx=10, pady=5)
-            
-            self.apk2aab_output = tk.Entry(output_row, width=60)
-            self.apk2aab_output.insert(0, str(self.config.aab_dir))
-            self.apk2aab_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(output_row, text="浏览",
-                     command=lambda: self.browse_folder(self.apk2aab_output)).pack(side="left")
-            
-            self.apk2aab_auto_sign_var = tk.BooleanVar(value=True)
-            tk.Checkbutton(tab, text="自动生成随机签名（推荐）", 
-                          variable=self.apk2aab_auto_sign_var).pack(anchor="w", padx=20, pady=10)
-            
-            self.btn_apk2aab = tk.Button(tab, text="🚀 开始转换", font=("", 14, "bold"),
-                                        command=self.run_apk2aab)
-            self.btn_apk2aab.pack(pady=20)
+        self.apk2aab_input = self._input_row(tab, "📂 输入APK文件/文件夹:", "选择APK文件或apk文件夹...",
+                                             self.browse_apk_file, self.browse_apk_folder)
+        self.apk_info_label = self._info_label(tab)
+        self.apk2aab_output = self._output_row(tab, "📁 输出目录:", self.config.aab_dir_s)
+        self.apk2aab_auto_sign = self._sign_option(tab, "自动生成随机签名（推荐）")
+        self.btn_apk2aab = self._start_button(tab, "🚀 开始转换", self.run_apk2aab)
+        self.apk2aab_error = self._error_label(tab)
     
     def setup_tab_aab2apks(self):
         """设置 AAB → APKS 标签页"""
         tab = self.tab_aab2apks
         
+        self.aab2apks_input = self._input_row(tab, "📂 输入AAB文件/文件夹:", "选择AAB文件或aab文件夹...",
+                                              self.browse_aab_file, self.browse_aab_folder)
+        self.aab_info_label = self._info_label(tab)
+        self.aab2apks_output = self._output_row(tab, "📁 输出目录:", self.config.apks_dir_s)
+        
+        # 转换模式
+        frame_mode = self._section(tab, "⚙️ 转换模式:")
         if CTK_AVAILABLE:
-            # 输入文件
-            frame_input = ctk.CTkFrame(tab)
-            frame_input.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_input, text="📂 输入AAB文件/文件夹:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            input_row = ctk.CTkFrame(frame_input, fg_color="transparent")
-            input_row.pack(fill="x", padx=5, pady=5)
-            
-            self.aab2apks_input = ctk.CTkEntry(input_row, width=500, placeholder_text="选择AAB文件或aab文件夹...")
-            self.aab2apks_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(input_row, text="浏览文件", width=100,
-                         command=self.browse_aab_file).pack(side="left", padx=2)
-            ctk.CTkButton(input_row, text="浏览文件夹", width=100,
-                         command=self.browse_aab_folder).pack(side="left", padx=2)
-            
-            # 文件信息显示
-            self.aab_info_frame = ctk.CTkFrame(tab)
-            self.aab_info_frame.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(self.aab_info_frame, text="📋 文件信息:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.aab_info_label = ctk.CTkLabel(self.aab_info_frame, 
-                                              text="选择文件后显示信息...",
-                                              justify="left")
-            self.aab_info_label.pack(anchor="w", padx=20, pady=5)
-            
-            # 输出目录
-            frame_output = ctk.CTkFrame(tab)
-            frame_output.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_output, text="📁 输出目录:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            output_row = ctk.CTkFrame(frame_output, fg_color="transparent")
-            output_row.pack(fill="x", padx=5, pady=5)
-            
-            self.aab2apks_output = ctk.CTkEntry(output_row, width=500)
-            self.aab2apks_output.insert(0, str(self.config.apks_dir))
-            self.aab2apks_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(output_row, text="浏览", width=100,
-                         command=lambda: self.browse_folder(self.aab2apks_output)).pack(side="left")
-            
-            # 转换模式
-            frame_mode = ctk.CTkFrame(tab)
-            frame_mode.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_mode, text="⚙️ 转换模式:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
+            # 一个分段按钮代替四个单选按钮，模式说明放在下方的一个标签里
             self.aab2apks_mode = ctk.StringVar(value="universal")
-            
-            modes = [
-                ("default - 拆分APK（Google Play标准）", "default"),
-                ("universal - 通用单APK（推荐侧载）", "universal"),
-                ("system - 系统预装APK", "system"),
-                ("instant - 即时应用", "instant"),
-            ]
-            
-            for text, value in modes:
-                ctk.CTkRadioButton(frame_mode, text=text, variable=self.aab2apks_mode, 
-                                  value=value).pack(anchor="w", padx=20, pady=3)
-            
-            # 签名选项
-            frame_sign = ctk.CTkFrame(tab)
-            frame_sign.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_sign, text="🔐 签名设置:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.aab2apks_auto_sign = ctk.CTkCheckBox(frame_sign, text="使用签名（需要keystore）")
-            self.aab2apks_auto_sign.select()
-            self.aab2apks_auto_sign.pack(anchor="w", padx=20, pady=5)
-            
-            # 转换按钮
-            self.btn_aab2apks = ctk.CTkButton(tab, text="🚀 开始转换", height=40,
-                                             font=ctk.CTkFont(size=16, weight="bold"),
-                                             command=self.run_aab2apks)
-            self.btn_aab2apks.pack(pady=20)
-            
+            ctk.CTkSegmentedButton(frame_mode, values=list(APKS_MODE_VALUES),
+                                   variable=self.aab2apks_mode).pack(anchor="w", padx=20, pady=3)
+            ctk.CTkLabel(frame_mode, text="\n".join(text for text, _ in AAB2APKS_MODES),
+                        justify="left").pack(anchor="w", padx=20, pady=3)
         else:
-            tk.Label(tab, text="📂 输入AAB文件/文件夹:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            input_row = tk.Frame(tab)
-            input_row.pack(fill="x", padx=10, pady=5)
-            
-            self.aab2apks_input = tk.Entry(input_row, width=60)
-            self.aab2apks_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(input_row, text="浏览文件",
-                     command=self.browse_aab_file).pack(side="left", padx=2)
-            tk.Button(input_row, text="浏览文件夹",
-                     command=self.browse_aab_folder).pack(side="left", padx=2)
-            
-            self.aab_info_label = tk.Label(tab, text="选择文件后显示信息...", justify="left")
-            self.aab_info_label.pack(anchor="w", padx=20, pady=10)
-            
-            tk.Label(tab, text="📁 输出目录:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            output_row = tk.Frame(tab)
-            output_row.pack(fill="x", padx=10, pady=5)
-            
-            self.aab2apks_output = tk.Entry(output_row, width=60)
-            self.aab2apks_output.insert(0, str(self.config.apks_dir))
-            self.aab2apks_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(output_row, text="浏览",
-                     command=lambda: self.browse_folder(self.aab2apks_output)).pack(side="left")
-            
-            tk.Label(tab, text="⚙️ 转换模式:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
             self.aab2apks_mode = tk.StringVar(value="universal")
-            
-            modes = [
-                ("default - 拆分APK", "default"),
-                ("universal - 通用单APK（推荐）", "universal"),
-                ("system - 系统APK", "system"),
-                ("instant - 即时应用", "instant"),
-            ]
-            
-            for text, value in modes:
-                tk.Radiobutton(tab, text=text, variable=self.aab2apks_mode,
+            for text, value in AAB2APKS_MODES:
+                tk.Radiobutton(frame_mode, text=text, variable=self.aab2apks_mode,
                               value=value).pack(anchor="w", padx=20, pady=2)
-            
-            self.aab2apks_auto_sign_var = tk.BooleanVar(value=True)
-            tk.Checkbutton(tab, text="使用签名（需要keystore）", 
-                          variable=self.aab2apks_auto_sign_var).pack(anchor="w", padx=20, pady=10)
-            
-            self.btn_aab2apks = tk.Button(tab, text="🚀 开始转换", font=("", 14, "bold"),
-                                         command=self.run_aab2apks)
-            self.btn_aab2apks.pack(pady=20)
+        
+        self.aab2apks_auto_sign = self._sign_option(tab, "使用签名（需要keystore）")
+        self.btn_aab2apks = self._start_button(tab, "🚀 开始转换", self.run_aab2apks)
+        self.aab2apks_error = self._error_label(tab)
     
     def setup_tab_full(self):
         """设置全流程转换标签页"""
         tab = self.tab_full
         
+        # 流程图示
         if CTK_AVAILABLE:
-            # 流程图示
             flow_frame = ctk.CTkFrame(tab)
             flow_frame.pack(fill="x", padx=10, pady=20)
-            
-            flow_label = ctk.CTkLabel(flow_frame, 
-                                     text="📦 APK  →  📦 AAB  →  📦 APKS",
-                                     font=ctk.CTkFont(size=20, weight="bold"))
-            flow_label.pack(pady=15)
-            
-            # 输入文件
-            frame_input = ctk.CTkFrame(tab)
-            frame_input.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_input, text="📂 输入APK文件/文件夹:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            input_row = ctk.CTkFrame(frame_input, fg_color="transparent")
-            input_row.pack(fill="x", padx=5, pady=5)
-            
-            self.full_input = ctk.CTkEntry(input_row, width=500, placeholder_text="选择APK文件或apk文件夹...")
-            self.full_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(input_row, text="浏览文件", width=100,
-                         command=self.browse_full_apk_file).pack(side="left", padx=2)
-            ctk.CTkButton(input_row, text="浏览文件夹", width=100,
-                         command=self.browse_full_apk_folder).pack(side="left", padx=2)
-            
-            # 文件信息显示
-            self.full_info_frame = ctk.CTkFrame(tab)
-            self.full_info_frame.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(self.full_info_frame, text="📋 文件信息:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.full_info_label = ctk.CTkLabel(self.full_info_frame, 
-                                               text="选择文件后显示信息...",
-                                               justify="left")
-            self.full_info_label.pack(anchor="w", padx=20, pady=5)
-            
-            # 输出目录
-            frame_output = ctk.CTkFrame(tab)
-            frame_output.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_output, text="📁 输出目录 (APKS):", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            output_row = ctk.CTkFrame(frame_output, fg_color="transparent")
-            output_row.pack(fill="x", padx=5, pady=5)
-            
-            self.full_output = ctk.CTkEntry(output_row, width=500)
-            self.full_output.insert(0, str(self.config.apks_dir))
-            self.full_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(output_row, text="浏览", width=100,
-                         command=lambda: self.browse_folder(self.full_output)).pack(side="left")
-            
-            # APKS模式选择
+            ctk.CTkLabel(flow_frame, text="📦 APK  →  📦 AAB  →  📦 APKS",
+                        font=self._fonts["bold20"]).pack(pady=15)
+        else:
+            tk.Label(tab, text="📦 APK  →  📦 AAB  →  📦 APKS",
+                    font=("", 18, "bold")).pack(pady=20)
+        
+        self.full_input = self._input_row(tab, "📂 输入APK文件/文件夹:", "选择APK文件或apk文件夹...",
+                                          self.browse_full_apk_file, self.browse_full_apk_folder)
+        self.full_info_label = self._info_label(tab)
+        self.full_output = self._output_row(tab, "📁 输出目录 (APKS):", self.config.apks_dir_s)
+        
+        # APKS模式选择
+        if CTK_AVAILABLE:
             mode_frame = ctk.CTkFrame(tab)
             mode_frame.pack(fill="x", padx=10, pady=10)
-            
             ctk.CTkLabel(mode_frame, text="⚙️ APKS输出模式:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(side="left", padx=5)
-            
-            self.full_mode = ctk.CTkComboBox(mode_frame, values=["default", "universal", "system", "instant"],
-                                            width=150)
+                        font=self._fonts["bold14"]).pack(side="left", padx=5)
+            self.full_mode = ctk.CTkSegmentedButton(mode_frame, values=list(APKS_MODE_VALUES))
             self.full_mode.set("universal")
             self.full_mode.pack(side="left", padx=10)
-            
-            # 签名选项
-            frame_sign = ctk.CTkFrame(tab)
-            frame_sign.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_sign, text="🔐 签名设置:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.full_auto_sign = ctk.CTkCheckBox(frame_sign, text="自动生成随机签名（推荐）")
-            self.full_auto_sign.select()
-            self.full_auto_sign.pack(anchor="w", padx=20, pady=5)
-            
-            # 转换按钮
-            self.btn_full = ctk.CTkButton(tab, text="🚀 一键转换", height=45,
-                                         font=ctk.CTkFont(size=18, weight="bold"),
-                                         command=self.run_full)
-            self.btn_full.pack(pady=25)
-            
         else:
-            tk.Label(tab, text="📦 APK  →  📦 AAB  →  📦 APKS",
-                    font=("", 18, "bold")).pack(pady=20)
-            
-            tk.Label(tab, text="📂 输入APK文件/文件夹:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            input_row = tk.Frame(tab)
-            input_row.pack(fill="x", padx=10, pady=5)
-            
-            self.full_input = tk.Entry(input_row, width=60)
-            self.full_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(input_row, text="浏览文件",
-                     command=self.browse_full_apk_file).pack(side="left", padx=2)
-            tk.Button(input_row, text="浏览文件夹",
-                     command=self.browse_full_apk_folder).pack(side="left", padx=2)
-            
-            self.full_info_label = tk.Label(tab, text="选择文件后显示信息...", justify="left")
-            self.full_info_label.pack(anchor="w", padx=20, pady=10)
-            
-            tk.Label(tab, text="📁 输出目录 (APKS):", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            output_row = tk.Frame(tab)
-            output_row.pack(fill="x", padx=10, pady=5)
-            
-            self.full_output = tk.Entry(output_row, width=60)
-            self.full_output.insert(0, str(self.config.apks_dir))
-            self.full_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(output_row, text="浏览",
-                     command=lambda: self.browse_folder(self.full_output)).pack(side="left")
-            
             mode_frame = tk.Frame(tab)
             mode_frame.pack(fill="x", padx=10, pady=10)
-            
             tk.Label(mode_frame, text="APKS模式:").pack(side="left", padx=5)
-            
             self.full_mode = tk.StringVar(value="universal")
-            from tkinter import ttk
-            mode_combo = ttk.Combobox(mode_frame, textvariable=self.full_mode,
-                                     values=["default", "universal", "system", "instant"], width=15)
-            mode_combo.pack(side="left", padx=10)
-            
-            self.full_auto_sign_var = tk.BooleanVar(value=True)
-            tk.Checkbutton(tab, text="自动生成随机签名（推荐）", 
-                          variable=self.full_auto_sign_var).pack(anchor="w", padx=20, pady=10)
-            
-            self.btn_full = tk.Button(tab, text="🚀 一键转换", font=("", 14, "bold"),
-                                     command=self.run_full)
-            self.btn_full.pack(pady=25)
+            ttk.Combobox(mode_frame, textvariable=self.full_mode,
+                        values=list(APKS_MODE_VALUES), width=15).pack(side="left", padx=10)
+        
+        self.full_auto_sign = self._sign_option(tab, "自动生成随机签名（推荐）")
+        self.btn_full = self._start_button(tab, "🚀 一键转换", self.run_full, size=18, height=45, pady=25)
+        self.full_error = self._error_label(tab)
     
     def setup_tab_split2apk(self):
         """设置拆分包→APK标签页"""
         tab = self.tab_split2apk
         
-        if CTK_AVAILABLE:
-            # 输入文件
-            frame_input = ctk.CTkFrame(tab)
-            frame_input.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_input, text="📂 输入拆分包 (.apks / .xapk / .apkm):", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            input_row = ctk.CTkFrame(frame_input, fg_color="transparent")
-            input_row.pack(fill="x", padx=5, pady=5)
-            
-            self.split2apk_input = ctk.CTkEntry(input_row, width=500, 
-                                               placeholder_text="选择APKS/XAPK/APKM文件或split_apk文件夹...")
-            self.split2apk_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(input_row, text="浏览文件", width=100,
-                         command=self.browse_split_file).pack(side="left", padx=2)
-            ctk.CTkButton(input_row, text="浏览文件夹", width=100,
-                         command=self.browse_split_folder).pack(side="left", padx=2)
-            
-            # 输出目录
-            frame_output = ctk.CTkFrame(tab)
-            frame_output.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_output, text="📁 输出目录:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            output_row = ctk.CTkFrame(frame_output, fg_color="transparent")
-            output_row.pack(fill="x", padx=5, pady=5)
-            
-            self.split2apk_output = ctk.CTkEntry(output_row, width=500)
-            self.split2apk_output.insert(0, str(self.config.apk2_dir))
-            self.split2apk_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            ctk.CTkButton(output_row, text="浏览", width=100,
-                         command=lambda: self.browse_folder(self.split2apk_output)).pack(side="left")
-            
-            # 文件信息显示
-            self.split_info_frame = ctk.CTkFrame(tab)
-            self.split_info_frame.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(self.split_info_frame, text="📋 文件信息:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.split_info_label = ctk.CTkLabel(self.split_info_frame, 
-                                                text="选择文件后显示信息...",
-                                                justify="left")
-            self.split_info_label.pack(anchor="w", padx=20, pady=5)
-            
-            # 签名选项
-            frame_sign = ctk.CTkFrame(tab)
-            frame_sign.pack(fill="x", padx=10, pady=10)
-            
-            ctk.CTkLabel(frame_sign, text="🔐 签名设置:", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=5, pady=5)
-            
-            self.split2apk_auto_sign = ctk.CTkCheckBox(frame_sign, text="合并后自动签名（推荐）")
-            self.split2apk_auto_sign.select()
-            self.split2apk_auto_sign.pack(anchor="w", padx=20, pady=5)
-            
-            # 转换按钮
-            self.btn_split2apk = ctk.CTkButton(tab, text="🚀 提取/合并APK", height=40,
-                                              font=ctk.CTkFont(size=16, weight="bold"),
-                                              command=self.run_split2apk)
-            self.btn_split2apk.pack(pady=20)
-            
-        else:
-            tk.Label(tab, text="📂 输入拆分包 (.apks/.xapk/.apkm):", 
-                    font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            input_row = tk.Frame(tab)
-            input_row.pack(fill="x", padx=10, pady=5)
-            
-            self.split2apk_input = tk.Entry(input_row, width=60)
-            self.split2apk_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(input_row, text="浏览文件",
-                     command=self.browse_split_file).pack(side="left", padx=2)
-            tk.Button(input_row, text="浏览文件夹",
-                     command=self.browse_split_folder).pack(side="left", padx=2)
-            
-            tk.Label(tab, text="📁 输出目录:", font=("", 12, "bold")).pack(anchor="w", padx=10, pady=5)
-            
-            output_row = tk.Frame(tab)
-            output_row.pack(fill="x", padx=10, pady=5)
-            
-            self.split2apk_output = tk.Entry(output_row, width=60)
-            self.split2apk_output.insert(0, str(self.config.apk2_dir))
-            self.split2apk_output.pack(side="left", fill="x", expand=True, padx=(0, 10))
-            
-            tk.Button(output_row, text="浏览",
-                     command=lambda: self.browse_folder(self.split2apk_output)).pack(side="left")
-            
-            self.split_info_label = tk.Label(tab, text="选择文件后显示信息...", justify="left")
-            self.split_info_label.pack(anchor="w", padx=20, pady=10)
-            
-            self.split2apk_auto_sign_var = tk.BooleanVar(value=True)
-            tk.Checkbutton(tab, text="合并后自动签名（推荐）", 
-                          variable=self.split2apk_auto_sign_var).pack(anchor="w", padx=20, pady=10)
-            
-            self.btn_split2apk = tk.Button(tab, text="🚀 提取/合并APK", font=("", 14, "bold"),
-                                          command=self.run_split2apk)
-            self.btn_split2apk.pack(pady=20)
+        self.split2apk_input = self._input_row(tab, "📂 输入拆分包 (.apks / .xapk / .apkm):",
+                                               "选择APKS/XAPK/APKM文件或split_apk文件夹...",
+                                               self.browse_split_file, self.browse_split_folder)
+        self.split2apk_output = self._output_row(tab, "📁 输出目录:", self.config.apk2_dir_s)
+        self.split_info_label = self._info_label(tab)
+        self.split2apk_auto_sign = self._sign_option(tab, "合并后自动签名（推荐）")
+        self.btn_split2apk = self._start_button(tab, "🚀 提取/合并APK", self.run_split2apk)
+        self.split2apk_error = self._error_label(tab)
     
     def create_log_area(self):
         """创建日志输出区域"""
@@ -748,7 +814,7 @@ class ConverterGUI:
             title_row.pack(fill="x", padx=5, pady=5)
             
             ctk.CTkLabel(title_row, text="📜 日志输出", 
-                        font=ctk.CTkFont(size=14, weight="bold")).pack(side="left")
+                        font=self._fonts["bold14"]).pack(side="left")
             
             ctk.CTkButton(title_row, text="清空", width=60,
                          command=self.clear_log).pack(side="right", padx=2)
@@ -779,6 +845,22 @@ class ConverterGUI:
             scrollbar.pack(side="right", fill="y")
             self.log_text.config(yscrollcommand=scrollbar.set)
             scrollbar.config(command=self.log_text.yview)
+        
+        # 日志框保持可写状态（插入时不需要来回切换state），只屏蔽键盘编辑
+        # CTkTextbox的bind会转发到内部的tk.Text
+        self.log_text.bind("<Key>", self._log_key_filter)
+    
+    # 日志框中允许的按键：光标移动，以及 Ctrl+C / Ctrl+A
+    LOG_NAV_KEYS = frozenset({"Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next"})
+    
+    @classmethod
+    def _log_key_filter(cls, event):
+        """屏蔽日志框中会修改内容的按键"""
+        if event.state & 0x4 and event.keysym.lower() in ("c", "a"):
+            return None
+        if event.keysym in cls.LOG_NAV_KEYS:
+            return None
+        return "break"
     
     def create_status_bar(self):
         """创建状态栏"""
@@ -797,73 +879,95 @@ class ConverterGUI:
             status_frame = tk.Frame(self.main_frame, height=30)
             status_frame.pack(fill="x", padx=5, pady=5)
             
-            from tkinter import ttk
             self.progress_bar = ttk.Progressbar(status_frame, length=300, mode='determinate')
             self.progress_bar.pack(side="left", padx=10, pady=5)
             
             self.status_label = tk.Label(status_frame, text="就绪")
             self.status_label.pack(side="left", padx=10)
+        
+        self.stop_button = self._button(status_frame, "⏹ 停止", self.cancel_task)
+        self.stop_button.pack(side="right", padx=10)
+        self.stop_button.configure(state="disabled")
     
     # ==================== 辅助方法 ====================
     
-    def browse_file(self, entry_widget, filetypes):
-        """浏览选择文件"""
+    def browse_file(self, entry_widget, filetypes, set_info=None, update_info=None):
+        """浏览选择文件；指定update_info时在后台读取所选文件的信息并通过set_info显示"""
         filename = filedialog.askopenfilename(filetypes=filetypes)
         if filename:
-            if CTK_AVAILABLE:
-                entry_widget.delete(0, "end")
-                entry_widget.insert(0, filename)
-            else:
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, filename)
+            entry_widget.delete(0, "end")
+            entry_widget.insert(0, filename)
+            if update_info:
+                self._run_info_task(set_info, update_info, filename)
     
-    def browse_folder(self, entry_widget):
-        """浏览选择文件夹"""
+    def browse_folder(self, entry_widget, set_info=None, update_info=None, *info_args):
+        """浏览选择文件夹；指定update_info时在后台读取文件夹信息（info_args为附加参数）"""
         folder = filedialog.askdirectory()
         if folder:
-            if CTK_AVAILABLE:
-                entry_widget.delete(0, "end")
-                entry_widget.insert(0, folder)
-            else:
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, folder)
+            entry_widget.delete(0, "end")
+            entry_widget.insert(0, folder)
+            if update_info:
+                self._run_info_task(set_info, update_info, folder, *info_args)
     
     # ==================== APK → AAB 文件浏览方法 ====================
     
+    def _run_info_task(self, set_info, func, *args):
+        """在后台线程中读取文件信息（aapt2、读zip目录等），避免选择大文件时界面卡住
+        
+        读取期间先在信息标签上显示提示，结果由func通过set_info更新。
+        同一面板上再次选择文件后，之前尚未完成的读取结果直接丢弃。
+        """
+        generation = self._info_generation.get(set_info, 0) + 1
+        self._info_generation[set_info] = generation
+        set_info("⏳ 正在读取文件信息...")
+        
+        def run():
+            self._info_local.token = (set_info, generation)
+            try:
+                func(*args)
+            finally:
+                self._info_local.token = None
+        
+        self._info_pool.submit(run)
+    
+    def _set_label_text(self, label, text):
+        """在GUI线程中更新标签文本（文本没有变化时不重新配置标签；过期的文件信息读取结果忽略）"""
+        token = getattr(self._info_local, 'token', None)
+        
+        def apply():
+            if token is not None and self._info_generation.get(token[0]) != token[1]:
+                return
+            if self._label_cache.get(label) == text:
+                return
+            self._label_cache[label] = text
+            label.configure(text=text)
+        self._call_in_gui(apply)
+    
+    def _call_in_gui(self, func, *args):
+        """在GUI线程中执行func（可在工作线程中调用，窗口已关闭时忽略）"""
+        try:
+            self.root.after(0, func, *args)
+        except (tk.TclError, RuntimeError):
+            pass
+    
     def browse_apk_file(self):
         """浏览选择APK文件并更新信息"""
-        filename = filedialog.askopenfilename(filetypes=[("APK文件", "*.apk")])
-        if filename:
-            if CTK_AVAILABLE:
-                self.apk2aab_input.delete(0, "end")
-                self.apk2aab_input.insert(0, filename)
-            else:
-                self.apk2aab_input.delete(0, tk.END)
-                self.apk2aab_input.insert(0, filename)
-            self.update_apk_file_info(filename)
+        self.browse_file(self.apk2aab_input, APK_FILETYPES, self.set_apk_info, self.update_apk_file_info)
     
     def browse_apk_folder(self):
         """浏览选择APK文件夹并更新信息"""
-        folder = filedialog.askdirectory()
-        if folder:
-            if CTK_AVAILABLE:
-                self.apk2aab_input.delete(0, "end")
-                self.apk2aab_input.insert(0, folder)
-            else:
-                self.apk2aab_input.delete(0, tk.END)
-                self.apk2aab_input.insert(0, folder)
-            self.update_apk_folder_info(folder, self.set_apk_info)
+        self.browse_folder(self.apk2aab_input, self.set_apk_info, self.update_apk_folder_info, self.set_apk_info)
     
     def update_apk_file_info(self, file_path):
         """更新APK文件信息显示"""
         try:
-            from pathlib import Path
             file_path = Path(file_path)
             if not file_path.exists():
                 self.set_apk_info("文件不存在")
                 return
             
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            st = file_path.stat()
+            size_mb = st.st_size / (1024 * 1024)
             
             info_lines = [
                 f"📄 文件名: {file_path.name}",
@@ -872,41 +976,31 @@ class ConverterGUI:
             
             # 尝试使用aapt2获取更多信息
             try:
-                import subprocess
-                cmd = [str(self.config.aapt2), "dump", "badging", str(file_path)]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0:
-                    output = result.stdout
+                badging = _cached_badging(str(self.config.aapt2), str(file_path),
+                                          st.st_mtime_ns, st.st_size, _APK_INFO_FIELDS)
+                if badging is not None:
                     
-                    # 解析包名
-                    import re
-                    pkg_match = re.search(r"package: name='([^']+)'", output)
-                    if pkg_match:
-                        info_lines.append(f"📛 包名: {pkg_match.group(1)}")
+                    # 包名
+                    if "package" in badging:
+                        info_lines.append(f"📛 包名: {badging['package']}")
                     
-                    # 解析版本
-                    ver_match = re.search(r"versionName='([^']+)'", output)
-                    ver_code_match = re.search(r"versionCode='([^']+)'", output)
-                    if ver_match:
-                        ver_info = ver_match.group(1)
-                        if ver_code_match:
-                            ver_info += f" ({ver_code_match.group(1)})"
+                    # 版本
+                    if "version_name" in badging:
+                        ver_info = badging["version_name"]
+                        if "version_code" in badging:
+                            ver_info += f" ({badging['version_code']})"
                         info_lines.append(f"🏷️ 版本: {ver_info}")
                     
-                    # 解析SDK版本
-                    sdk_match = re.search(r"sdkVersion:'(\d+)'", output)
-                    target_match = re.search(r"targetSdkVersion:'(\d+)'", output)
-                    if sdk_match:
-                        sdk_info = f"SDK: {sdk_match.group(1)}"
-                        if target_match:
-                            sdk_info += f" / 目标: {target_match.group(1)}"
+                    # SDK版本
+                    if "sdk" in badging:
+                        sdk_info = f"SDK: {badging['sdk']}"
+                        if "target_sdk" in badging:
+                            sdk_info += f" / 目标: {badging['target_sdk']}"
                         info_lines.append(f"📱 {sdk_info}")
                     
-                    # 解析应用名称
-                    label_match = re.search(r"application-label:'([^']*)'", output)
-                    if label_match and label_match.group(1):
-                        info_lines.append(f"📝 名称: {label_match.group(1)}")
+                    # 应用名称
+                    if badging.get("label"):
+                        info_lines.append(f"📝 名称: {badging['label']}")
             except:
                 pass
             
@@ -919,20 +1013,19 @@ class ConverterGUI:
     def update_apk_folder_info(self, folder_path, set_info_func):
         """更新APK文件夹信息显示"""
         try:
-            from pathlib import Path
             folder = Path(folder_path)
             if not folder.exists():
                 set_info_func("文件夹不存在")
                 return
             
-            apk_files = list(folder.glob("*.apk"))
+            apk_files = _scan_entries(folder, {'.apk'})
             total = len(apk_files)
             
             if total == 0:
                 set_info_func("📂 文件夹中没有找到APK文件")
                 return
             
-            total_size = sum(f.stat().st_size for f in apk_files)
+            total_size = _total_size(apk_files)
             
             info_lines = [
                 f"📂 文件夹: {folder.name}",
@@ -941,13 +1034,7 @@ class ConverterGUI:
             ]
             
             # 显示前几个文件名
-            if total <= 5:
-                for f in apk_files:
-                    info_lines.append(f"   - {f.name}")
-            else:
-                for f in apk_files[:3]:
-                    info_lines.append(f"   - {f.name}")
-                info_lines.append(f"   ... 还有 {total - 3} 个文件")
+            info_lines.extend(_preview_lines(apk_files))
             
             set_info_func("\n".join(info_lines))
             
@@ -955,50 +1042,29 @@ class ConverterGUI:
             set_info_func(f"❌ 读取文件夹信息失败: {str(e)}")
     
     def set_apk_info(self, text):
-        """设置APK信息显示"""
-        if CTK_AVAILABLE:
-            self.apk_info_label.configure(text=text)
-        else:
-            self.apk_info_label.configure(text=text)
+        """设置APK信息显示（可在后台线程中调用）"""
+        self._set_label_text(self.apk_info_label, text)
     
     # ==================== AAB → APKS 文件浏览方法 ====================
     
     def browse_aab_file(self):
         """浏览选择AAB文件并更新信息"""
-        filename = filedialog.askopenfilename(filetypes=[("AAB文件", "*.aab")])
-        if filename:
-            if CTK_AVAILABLE:
-                self.aab2apks_input.delete(0, "end")
-                self.aab2apks_input.insert(0, filename)
-            else:
-                self.aab2apks_input.delete(0, tk.END)
-                self.aab2apks_input.insert(0, filename)
-            self.update_aab_file_info(filename)
+        self.browse_file(self.aab2apks_input, AAB_FILETYPES, self.set_aab_info, self.update_aab_file_info)
     
     def browse_aab_folder(self):
         """浏览选择AAB文件夹并更新信息"""
-        folder = filedialog.askdirectory()
-        if folder:
-            if CTK_AVAILABLE:
-                self.aab2apks_input.delete(0, "end")
-                self.aab2apks_input.insert(0, folder)
-            else:
-                self.aab2apks_input.delete(0, tk.END)
-                self.aab2apks_input.insert(0, folder)
-            self.update_aab_folder_info(folder)
+        self.browse_folder(self.aab2apks_input, self.set_aab_info, self.update_aab_folder_info)
     
     def update_aab_file_info(self, file_path):
         """更新AAB文件信息显示"""
         try:
-            from pathlib import Path
-            import zipfile
-            
             file_path = Path(file_path)
             if not file_path.exists():
                 self.set_aab_info("文件不存在")
                 return
             
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            st = file_path.stat()
+            size_mb = st.st_size / (1024 * 1024)
             
             info_lines = [
                 f"📄 文件名: {file_path.name}",
@@ -1006,60 +1072,14 @@ class ConverterGUI:
             ]
             
             # 分析AAB内容
-            try:
-                with zipfile.ZipFile(file_path, 'r') as zf:
-                    namelist = zf.namelist()
-                    
-                    # 统计模块
-                    modules = set()
-                    for name in namelist:
-                        if '/' in name:
-                            module = name.split('/')[0]
-                            if module not in ['META-INF', 'BUNDLE-METADATA']:
-                                modules.add(module)
-                    
-                    if modules:
-                        info_lines.append(f"📦 模块: {', '.join(sorted(modules))}")
-                    
-                    # 检查是否有原生库
-                    has_native = any('lib/' in n and n.endswith('.so') for n in namelist)
-                    if has_native:
-                        # 检查支持的架构
-                        archs = set()
-                        for n in namelist:
-                            if 'lib/' in n and n.endswith('.so'):
-                                parts = n.split('/')
-                                for i, p in enumerate(parts):
-                                    if p == 'lib' and i + 1 < len(parts):
-                                        archs.add(parts[i + 1])
-                        if archs:
-                            info_lines.append(f"🔧 原生库架构: {', '.join(sorted(archs))}")
-                    
-                    # 检查资源
-                    has_res = any(n.startswith('base/res/') for n in namelist)
-                    has_assets = any(n.startswith('base/assets/') for n in namelist)
-                    
-                    features = []
-                    if has_res:
-                        features.append("资源文件")
-                    if has_assets:
-                        features.append("Assets")
-                    if has_native:
-                        features.append("原生库")
-                    
-                    if features:
-                        info_lines.append(f"📂 包含: {', '.join(features)}")
-                    
-            except:
-                pass
+            info_lines.extend(_aab_content_lines(str(file_path), st.st_mtime_ns, st.st_size))
             
             # 检查是否有对应的keystore
-            keystore_path = self.config.keystore_dir / f"{file_path.stem}.jks"
-            if keystore_path.exists():
+            keystore_stems, keystores = self._get_keystores()
+            if file_path.stem in keystore_stems:
                 info_lines.append(f"🔐 签名: 已找到对应keystore")
             else:
                 # 检查是否有任何可用的keystore
-                keystores = list(self.config.keystore_dir.glob("*.jks"))
                 if keystores:
                     info_lines.append(f"🔐 签名: 将使用 {keystores[0].name}")
                 else:
@@ -1071,23 +1091,37 @@ class ConverterGUI:
         except Exception as e:
             self.set_aab_info(f"❌ 读取文件信息失败: {str(e)}")
     
+    def _get_keystores(self):
+        """返回keystore目录中的 (.jks文件名集合(不含扩展名), .jks文件列表)
+        
+        以目录的修改时间作为缓存版本，目录没有变化时不再重新列目录。
+        """
+        try:
+            mtime = self.config.keystore_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return frozenset(), []
+        
+        if self._keystore_cache[0] != mtime:
+            keystores = [Path(entry.path) for entry in _scan_entries(self.config.keystore_dir, {'.jks'})]
+            self._keystore_cache = (mtime, (frozenset(p.stem for p in keystores), keystores))
+        return self._keystore_cache[1]
+    
     def update_aab_folder_info(self, folder_path):
         """更新AAB文件夹信息显示"""
         try:
-            from pathlib import Path
             folder = Path(folder_path)
             if not folder.exists():
                 self.set_aab_info("文件夹不存在")
                 return
             
-            aab_files = list(folder.glob("*.aab"))
+            aab_files = _scan_entries(folder, {'.aab'})
             total = len(aab_files)
             
             if total == 0:
                 self.set_aab_info("📂 文件夹中没有找到AAB文件")
                 return
             
-            total_size = sum(f.stat().st_size for f in aab_files)
+            total_size = _total_size(aab_files)
             
             info_lines = [
                 f"📂 文件夹: {folder.name}",
@@ -1095,13 +1129,7 @@ class ConverterGUI:
                 f"💾 总大小: {total_size / (1024*1024):.2f} MB",
             ]
             
-            if total <= 5:
-                for f in aab_files:
-                    info_lines.append(f"   - {f.name}")
-            else:
-                for f in aab_files[:3]:
-                    info_lines.append(f"   - {f.name}")
-                info_lines.append(f"   ... 还有 {total - 3} 个文件")
+            info_lines.extend(_preview_lines(aab_files))
             
             self.set_aab_info("\n".join(info_lines))
             
@@ -1109,48 +1137,29 @@ class ConverterGUI:
             self.set_aab_info(f"❌ 读取文件夹信息失败: {str(e)}")
     
     def set_aab_info(self, text):
-        """设置AAB信息显示"""
-        if CTK_AVAILABLE:
-            self.aab_info_label.configure(text=text)
-        else:
-            self.aab_info_label.configure(text=text)
+        """设置AAB信息显示（可在后台线程中调用）"""
+        self._set_label_text(self.aab_info_label, text)
     
     # ==================== 全流程转换文件浏览方法 ====================
     
     def browse_full_apk_file(self):
         """浏览选择全流程APK文件并更新信息"""
-        filename = filedialog.askopenfilename(filetypes=[("APK文件", "*.apk")])
-        if filename:
-            if CTK_AVAILABLE:
-                self.full_input.delete(0, "end")
-                self.full_input.insert(0, filename)
-            else:
-                self.full_input.delete(0, tk.END)
-                self.full_input.insert(0, filename)
-            self.update_full_apk_file_info(filename)
+        self.browse_file(self.full_input, APK_FILETYPES, self.set_full_info, self.update_full_apk_file_info)
     
     def browse_full_apk_folder(self):
         """浏览选择全流程APK文件夹并更新信息"""
-        folder = filedialog.askdirectory()
-        if folder:
-            if CTK_AVAILABLE:
-                self.full_input.delete(0, "end")
-                self.full_input.insert(0, folder)
-            else:
-                self.full_input.delete(0, tk.END)
-                self.full_input.insert(0, folder)
-            self.update_apk_folder_info(folder, self.set_full_info)
+        self.browse_folder(self.full_input, self.set_full_info, self.update_apk_folder_info, self.set_full_info)
     
     def update_full_apk_file_info(self, file_path):
         """更新全流程APK文件信息显示"""
         try:
-            from pathlib import Path
             file_path = Path(file_path)
             if not file_path.exists():
                 self.set_full_info("文件不存在")
                 return
             
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            st = file_path.stat()
+            size_mb = st.st_size / (1024 * 1024)
             
             info_lines = [
                 f"📄 文件名: {file_path.name}",
@@ -1159,25 +1168,18 @@ class ConverterGUI:
             
             # 尝试使用aapt2获取更多信息
             try:
-                import subprocess
-                import re
-                cmd = [str(self.config.aapt2), "dump", "badging", str(file_path)]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0:
-                    output = result.stdout
+                badging = _cached_badging(str(self.config.aapt2), str(file_path),
+                                          st.st_mtime_ns, st.st_size, _FULL_INFO_FIELDS)
+                if badging is not None:
                     
-                    pkg_match = re.search(r"package: name='([^']+)'", output)
-                    if pkg_match:
-                        info_lines.append(f"📛 包名: {pkg_match.group(1)}")
+                    if "package" in badging:
+                        info_lines.append(f"📛 包名: {badging['package']}")
                     
-                    ver_match = re.search(r"versionName='([^']+)'", output)
-                    if ver_match:
-                        info_lines.append(f"🏷️ 版本: {ver_match.group(1)}")
+                    if "version_name" in badging:
+                        info_lines.append(f"🏷️ 版本: {badging['version_name']}")
                     
-                    label_match = re.search(r"application-label:'([^']*)'", output)
-                    if label_match and label_match.group(1):
-                        info_lines.append(f"📝 名称: {label_match.group(1)}")
+                    if badging.get("label"):
+                        info_lines.append(f"📝 名称: {badging['label']}")
             except:
                 pass
             
@@ -1188,58 +1190,30 @@ class ConverterGUI:
             self.set_full_info(f"❌ 读取文件信息失败: {str(e)}")
     
     def set_full_info(self, text):
-        """设置全流程信息显示"""
-        if CTK_AVAILABLE:
-            self.full_info_label.configure(text=text)
-        else:
-            self.full_info_label.configure(text=text)
+        """设置全流程信息显示（可在后台线程中调用）"""
+        self._set_label_text(self.full_info_label, text)
     
     # ==================== 拆分包→APK 文件浏览方法 ====================
     
     def browse_split_file(self):
         """浏览选择拆分包文件并更新信息"""
-        filetypes = [("拆分包", "*.apks *.xapk *.apkm"),
-                     ("APKS", "*.apks"),
-                     ("XAPK", "*.xapk"),
-                     ("APKM", "*.apkm")]
-        filename = filedialog.askopenfilename(filetypes=filetypes)
-        if filename:
-            if CTK_AVAILABLE:
-                self.split2apk_input.delete(0, "end")
-                self.split2apk_input.insert(0, filename)
-            else:
-                self.split2apk_input.delete(0, tk.END)
-                self.split2apk_input.insert(0, filename)
-            # 更新文件信息
-            self.update_split_file_info(filename)
+        self.browse_file(self.split2apk_input, SPLIT_FILETYPES, self.set_split_info, self.update_split_file_info)
     
     def browse_split_folder(self):
         """浏览选择拆分包文件夹并更新信息"""
-        folder = filedialog.askdirectory()
-        if folder:
-            if CTK_AVAILABLE:
-                self.split2apk_input.delete(0, "end")
-                self.split2apk_input.insert(0, folder)
-            else:
-                self.split2apk_input.delete(0, tk.END)
-                self.split2apk_input.insert(0, folder)
-            # 更新文件夹信息
-            self.update_split_folder_info(folder)
+        self.browse_folder(self.split2apk_input, self.set_split_info, self.update_split_folder_info)
     
     def update_split_file_info(self, file_path):
         """更新拆分包文件信息显示"""
         try:
-            from pathlib import Path
-            import zipfile
-            import json
-            
             file_path = Path(file_path)
             if not file_path.exists():
                 self.set_split_info("文件不存在")
                 return
             
             # 获取文件大小
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            st = file_path.stat()
+            size_mb = st.st_size / (1024 * 1024)
             
             # 获取文件格式
             ext = file_path.suffix.lower()
@@ -1253,58 +1227,7 @@ class ConverterGUI:
             ]
             
             # 分析压缩包内容
-            try:
-                with zipfile.ZipFile(file_path, 'r') as zf:
-                    namelist = zf.namelist()
-                    
-                    # 统计APK文件
-                    apk_files = [n for n in namelist if n.endswith('.apk')]
-                    info_lines.append(f"📱 APK数量: {len(apk_files)} 个")
-                    
-                    # 检查是否有manifest
-                    manifest_files = [n for n in namelist if n in ['manifest.json', 'info.json', 'icon.png']]
-                    
-                    # 尝试获取包信息
-                    for manifest_name in ['manifest.json', 'info.json']:
-                        if manifest_name in namelist:
-                            try:
-                                manifest_data = zf.read(manifest_name)
-                                manifest = json.loads(manifest_data.decode('utf-8'))
-                                
-                                pkg_name = manifest.get('package_name', manifest.get('packageName', ''))
-                                version_name = manifest.get('version_name', manifest.get('versionName', ''))
-                                version_code = manifest.get('version_code', manifest.get('versionCode', ''))
-                                
-                                if pkg_name:
-                                    info_lines.append(f"📛 包名: {pkg_name}")
-                                if version_name:
-                                    info_lines.append(f"🏷️ 版本: {version_name} ({version_code})")
-                                break
-                            except:
-                                pass
-                    
-                    # 检查APK类型
-                    has_universal = any('universal' in n.lower() or 'standalone' in n.lower() for n in apk_files)
-                    has_base = any('base' in n.lower() for n in apk_files)
-                    split_configs = [n for n in apk_files if 'split_config' in n.lower() or 'config.' in n.lower()]
-                    
-                    if has_universal:
-                        info_lines.append(f"✅ 类型: Universal/Standalone APK（可直接提取）")
-                    elif has_base and split_configs:
-                        info_lines.append(f"🔧 类型: 拆分APK（需要合并）")
-                        info_lines.append(f"   - 基础APK + {len(split_configs)} 个配置APK")
-                    elif len(apk_files) == 1:
-                        info_lines.append(f"✅ 类型: 单一APK（可直接提取）")
-                    else:
-                        info_lines.append(f"🔧 类型: 多APK文件")
-                    
-                    # 检查OBB文件
-                    obb_files = [n for n in namelist if n.endswith('.obb')]
-                    if obb_files:
-                        info_lines.append(f"⚠️ OBB文件: {len(obb_files)} 个（将被忽略）")
-                        
-            except zipfile.BadZipFile:
-                info_lines.append("⚠️ 无法读取压缩包内容")
+            info_lines.extend(_split_content_lines(str(file_path), st.st_mtime_ns, st.st_size))
             
             self.set_split_info("\n".join(info_lines))
             
@@ -1314,19 +1237,19 @@ class ConverterGUI:
     def update_split_folder_info(self, folder_path):
         """更新拆分包文件夹信息显示"""
         try:
-            from pathlib import Path
-            
             folder = Path(folder_path)
             if not folder.exists():
                 self.set_split_info("文件夹不存在")
                 return
             
-            # 统计各类型文件
-            apks_files = list(folder.glob("*.apks"))
-            xapk_files = list(folder.glob("*.xapk"))
-            apkm_files = list(folder.glob("*.apkm"))
+            # 一次遍历目录，按扩展名统计各类型文件
+            split_files = _scan_entries(folder, SplitAPKtoAPKConverter.SUPPORTED_SUFFIXES)
+            counts = {'.apks': 0, '.xapk': 0, '.apkm': 0}
+            for f in split_files:
+                counts[os.path.splitext(f.name)[1].lower()] += 1
+            total_size = _total_size(split_files)
             
-            total = len(apks_files) + len(xapk_files) + len(apkm_files)
+            total = len(split_files)
             
             if total == 0:
                 self.set_split_info("📂 文件夹中没有找到拆分包文件\n   支持格式: .apks, .xapk, .apkm")
@@ -1337,15 +1260,13 @@ class ConverterGUI:
                 f"📦 共找到 {total} 个拆分包文件:",
             ]
             
-            if apks_files:
-                info_lines.append(f"   - APKS: {len(apks_files)} 个")
-            if xapk_files:
-                info_lines.append(f"   - XAPK: {len(xapk_files)} 个")
-            if apkm_files:
-                info_lines.append(f"   - APKM: {len(apkm_files)} 个")
+            if counts['.apks']:
+                info_lines.append(f"   - APKS: {counts['.apks']} 个")
+            if counts['.xapk']:
+                info_lines.append(f"   - XAPK: {counts['.xapk']} 个")
+            if counts['.apkm']:
+                info_lines.append(f"   - APKM: {counts['.apkm']} 个")
             
-            # 计算总大小
-            total_size = sum(f.stat().st_size for f in apks_files + xapk_files + apkm_files)
             info_lines.append(f"💾 总大小: {total_size / (1024*1024):.2f} MB")
             
             self.set_split_info("\n".join(info_lines))
@@ -1354,38 +1275,52 @@ class ConverterGUI:
             self.set_split_info(f"❌ 读取文件夹信息失败: {str(e)}")
     
     def set_split_info(self, text):
-        """设置拆分包信息显示"""
-        if CTK_AVAILABLE:
-            self.split_info_label.configure(text=text)
-        else:
-            self.split_info_label.configure(text=text)
+        """设置拆分包信息显示（可在后台线程中调用）"""
+        self._set_label_text(self.split_info_label, text)
     
     def log(self, message):
-        """添加日志消息"""
-        self.log_queue.put(message)
+        """添加日志消息（可在工作线程中调用）"""
+        self.log_queue.append(message)
+        self._log_notifier.notify()
     
-    def update_log(self):
-        """更新日志显示"""
+    def drain_log(self, event=None):
+        """更新日志和进度显示（每次把队列中的消息一次性取完，合并为一次插入）"""
+        # 先清除标志再取队列：取队列期间写入的日志会再发送一次事件，不会遗漏
+        self._log_notifier.clear()
+        
+        with self._progress_lock:
+            done, total, start, span = self._progress
+        value = start + span * done / total if total else start
+        if value != self._progress_shown:
+            self._progress_shown = value
+            self._apply_progress(value)
+        
+        # 最小化时不更新文本框（队列有长度上限，积压的只是最近的日志）
+        if self.root.state() == "iconic":
+            return
+        
+        messages = []
         try:
             while True:
-                message = self.log_queue.get_nowait()
-                if CTK_AVAILABLE:
-                    self.log_text.insert("end", message + "\n")
-                    self.log_text.see("end")
-                else:
-                    self.log_text.insert(tk.END, message + "\n")
-                    self.log_text.see(tk.END)
-        except queue.Empty:
+                messages.append(self.log_queue.popleft())
+        except IndexError:
             pass
         
-        self.root.after(100, self.update_log)
+        if messages:
+            # CTkTextbox和tk.Text使用相同的索引字符串（tk.END即"end"）
+            self.log_text.insert("end", "\n".join(messages) + "\n")
+            # 只保留最近的日志行，避免长时间批量转换后文本框越来越大
+            self.log_text.delete("1.0", f"end-{self.LOG_MAX_LINES}l")
+            self.log_text.see("end")
+    
+    def _on_map(self, event):
+        """窗口从最小化恢复时显示积压的日志（子控件的<Map>事件忽略）"""
+        if event.widget is self.root:
+            self.drain_log()
     
     def clear_log(self):
         """清空日志"""
-        if CTK_AVAILABLE:
-            self.log_text.delete("1.0", "end")
-        else:
-            self.log_text.delete("1.0", tk.END)
+        self.log_text.delete("1.0", "end")
     
     def save_log(self):
         """保存日志到文件"""
@@ -1394,25 +1329,47 @@ class ConverterGUI:
             filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
         )
         if filename:
-            if CTK_AVAILABLE:
-                content = self.log_text.get("1.0", "end")
-            else:
-                content = self.log_text.get("1.0", tk.END)
-            
-            with open(filename, 'w', encoding='utf-8') as f:
+            # 文本只能在GUI线程读取，写文件放到后台线程
+            content = self.log_text.get("1.0", "end")
+            self._pool.submit(self._write_log_file, filename, content)
+    
+    def _write_log_file(self, filename, content):
+        """把日志内容写入文件（在后台线程中执行）"""
+        try:
+            with open(filename, 'w', encoding='utf-8', buffering=65536) as f:
                 f.write(content)
-            
             self.log(f"日志已保存到: {filename}")
+        except OSError as e:
+            self.log(f"❌ 保存日志失败: {e}")
     
     def set_status(self, text):
         """设置状态栏文本"""
-        if CTK_AVAILABLE:
-            self.status_label.configure(text=text)
-        else:
-            self.status_label.config(text=text)
+        self.status_label.configure(text=text)
     
     def set_progress(self, value):
-        """设置进度条值 (0-1)"""
+        """设置进度条值 (0-1，可在工作线程中调用)
+        
+        只记录数值，和日志共用 <<LogAvailable>> 事件及其发送标志：
+        上一次刷新前的连续进度更新不再发送新事件，刷新时只设置一次进度条。
+        """
+        with self._progress_lock:
+            self._progress = [0, 0, value, 0.0]
+        self._log_notifier.notify()
+    
+    def begin_progress(self, total, start=0.0, span=1.0):
+        """开始按完成数计算进度：之后每次step_progress()进度增加 span / total"""
+        with self._progress_lock:
+            self._progress = [0, total, start, span]
+        self._log_notifier.notify()
+    
+    def step_progress(self):
+        """完成一项（可在多个工作线程中同时调用，只增加计数，不直接操作控件）"""
+        with self._progress_lock:
+            self._progress[0] += 1
+        self._log_notifier.notify()
+    
+    def _apply_progress(self, value):
+        """在GUI线程中设置进度条"""
         if CTK_AVAILABLE:
             self.progress_bar.set(value)
         else:
@@ -1424,55 +1381,210 @@ class ConverterGUI:
         
         if self.config.validate():
             self.log("✅ 所有工具检测通过")
+            self._pool.submit(self._prewarm_tools)
         else:
             self.log("❌ 部分工具缺失，请检查安装")
     
+    def _prewarm_tools(self):
+        """后台预热：创建转换器、读取keystore、生成bundletool的AppCDS归档，
+        并运行一次bundletool让JVM和jar文件进入系统缓存
+        
+        第一次转换时不必再冷启动JVM读取磁盘，失败不影响后续转换。
+        """
+        for converter_class in (APKtoAABConverter, AABtoAPKSConverter, SplitAPKtoAPKConverter):
+            self._converter(converter_class)
+        self.config.get_keystore()
+        warm_bundletool(self.config)
+    
+    def set_busy(self, busy):
+        """切换转换中/就绪状态：按钮、状态栏和进度条一次设置完（在GUI线程中调用）"""
+        if busy:
+            self._cancel.clear()
+        self.stop_button.configure(state="normal" if busy else "disabled")
+        self.set_buttons_state("disabled" if busy else "normal")
+        self.set_status("正在转换..." if busy else "就绪")
+        self.set_progress(0 if busy else 1)
+    
+    def cancel_task(self):
+        """停止当前转换：不再开始新的文件，并结束正在运行的外部工具（这些文件按失败处理）"""
+        self._cancel.set()
+        self.stop_button.configure(state="disabled")
+        self.set_status("正在停止...")
+        self.log("⏹ 正在停止...")
+        terminate_running_tools()
+    
+    def _on_close(self):
+        """关闭窗口：停止批量转换并释放后台线程池和事件循环，避免窗口关闭后后台继续转换剩余文件
+        
+        之后后台任务中的输出直接丢弃（日志通知和界面回调在窗口关闭后都会忽略TclError）。
+        """
+        self._cancel.set()
+        terminate_running_tools()
+        
+        # 取消事件循环中的批量转换（等待其结果的线程立即返回），再停止事件循环
+        for future in list(self._loop_futures):
+            future.cancel()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        
+        # 丢弃排队中的任务，不等待正在执行的任务
+        _shutdown_now(self._pool)
+        _shutdown_now(self._info_pool)
+        
+        self.root.destroy()
+    
     def set_buttons_state(self, state):
-        """设置所有按钮状态"""
-        if CTK_AVAILABLE:
-            self.btn_apk2aab.configure(state=state)
-            self.btn_aab2apks.configure(state=state)
-            self.btn_full.configure(state=state)
-            self.btn_split2apk.configure(state=state)
-        else:
-            self.btn_apk2aab.config(state=state)
-            self.btn_aab2apks.config(state=state)
-            self.btn_full.config(state=state)
-            self.btn_split2apk.config(state=state)
+        """设置所有按钮状态（只包含已构建标签页的按钮）"""
+        self._buttons_state = state
+        for button in self._start_buttons:
+            button.configure(state=state)
     
     # ==================== 转换任务 ====================
     
+    # 批量转换时同时处理的文件数：bundletool/签名都会启动JVM，两个任务交替进行
+    # （一个在读写磁盘时另一个在跑JVM）即可，再多只会争抢内存
+    # 同时运行的JVM总数也以此为上限（APK → AAB的事件循环和AAB → APKS线程共用名额）
+    BATCH_WORKERS = 2
+    
+    # 输入目录列表缓存的有效期（秒）
+    LISTING_TTL = 5.0
+    
+    # 输入路径存在性检查结果的有效期（秒）
+    PATH_CHECK_TTL = 2.0
+    
+    def _path_exists(self, path):
+        """检查输入路径是否存在（PATH_CHECK_TTL秒内直接使用上次的结果，避免在网络驱动器上重复stat）"""
+        now = time.monotonic()
+        cached = self._path_exists_cache.get(path)
+        if cached and now - cached[0] < self.PATH_CHECK_TTL:
+            return cached[1]
+        
+        exists = os.path.exists(path) if path else False
+        self._path_exists_cache[path] = (now, exists)
+        return exists
+    
+    def _list_files(self, folder, suffixes):
+        """列出批量转换的输入文件（一次os.scandir遍历，扩展名不区分大小写）
+        
+        结果按 (目录, 扩展名) 缓存：在LISTING_TTL秒内且目录修改时间未变时直接复用，
+        连续对同一个大目录（如网络驱动器）执行转换时不必重新列目录。
+        """
+        key = (str(folder), frozenset(suffixes))
+        mtime = os.stat(folder).st_mtime_ns
+        now = time.monotonic()
+        
+        cached = self._listing_cache.get(key)
+        if cached and cached[1] == mtime and now - cached[0] < self.LISTING_TTL:
+            return list(cached[2])
+        
+        files = sorted(Path(entry.path) for entry in _scan_entries(folder, suffixes))
+        self._listing_cache[key] = (now, mtime, files)
+        return list(files)
+    
+    def _pending_files(self, files, output_for):
+        """过滤掉输出文件已存在且不比输入旧的文件，返回仍需转换的列表
+        
+        output_for(输入文件) 返回对应的输出路径；跳过的数量写入日志。
+        """
+        pending = [f for f in files if not _is_up_to_date(output_for(f), f.stat().st_mtime_ns)]
+        if len(pending) < len(files):
+            self.log(f"跳过 {len(files) - len(pending)} 个输出已是最新的文件")
+        return pending
+    
+    def _converter(self, converter_class):
+        """返回整个会话共用的转换器实例（转换器本身不保存单次转换的状态）"""
+        converter = self._converters.get(converter_class)
+        if converter is None:
+            converter = self._converters[converter_class] = converter_class(self.config)
+        return converter
+    
+    def _event_loop(self):
+        """返回在守护线程中运行的事件循环（首次调用时创建）"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="conv-async", daemon=True).start()
+        return self._loop
+    
+    def _convert_apks(self, apk_files, progress=None, on_done=None, output_dir=None, auto_sign=True):
+        """在后台事件循环中并发转换多个APK为AAB，阻塞直到全部完成
+        
+        各APK的aapt2/bundletool/jarsigner子进程用asyncio.subprocess启动，
+        等待子进程时不占用线程；同时转换的数量以CPU核心数为上限，
+        其中同时运行的JVM数量受共用的_jvm_slots限制。
+        progress/on_done回调在事件循环线程中调用；点击停止后未开始的APK不在结果中。
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            convert_batch_async(self.config, apk_files, auto_sign=auto_sign, output_dir=output_dir,
+                                limit=os.cpu_count(), progress=progress, on_done=on_done,
+                                cancel=self._cancel, jvm_semaphore=self._jvm_slots,
+                                converter=self._converter(APKtoAABConverter)),
+            self._event_loop()
+        )
+        self._loop_futures.add(future)
+        try:
+            return future.result()
+        finally:
+            self._loop_futures.discard(future)
+    
+    def _convert_parallel(self, convert_one, files):
+        """并发转换多个文件，按完成顺序逐个返回 (文件, 结果)，单个文件出错记为失败
+        
+        点击停止后尚未开始的文件直接跳过（不返回），正在转换的文件因外部工具被结束按失败返回。
+        """
+        skipped = object()
+        
+        def run(file_path):
+            if self._cancel.is_set():
+                return skipped
+            return convert_one(file_path)
+        
+        with ThreadPoolExecutor(max_workers=self.BATCH_WORKERS) as pool:
+            futures = {pool.submit(run, f): f for f in files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.log(f"❌ 错误 {file_path.name}: {e}")
+                    result = None
+                if result is not skipped:
+                    yield file_path, result
+    
+    def _validate_paths(self, error_label, input_path, output_dir):
+        """检查输入/输出路径，返回是否通过
+        
+        错误信息显示在开始按钮下方的标签中，不弹出模态对话框（日志和进度照常刷新）；
+        检查通过时清空上次的错误信息。
+        """
+        if not input_path:
+            error = "请选择输入文件或文件夹"
+        elif not self._path_exists(input_path):
+            error = f"路径不存在: {input_path}"
+        elif not output_dir:
+            error = "请指定输出目录"
+        else:
+            error = ""
+        
+        error_label.configure(text=f"❌ {error}" if error else "")
+        return not error
+    
     def run_apk2aab(self):
         """运行 APK → AAB 转换"""
         input_path = self.apk2aab_input.get().strip()
         output_dir = self.apk2aab_output.get().strip()
         
         # 获取签名选项
-        if CTK_AVAILABLE:
-            auto_sign = self.apk2aab_auto_sign.get() == 1
-        else:
-            auto_sign = self.apk2aab_auto_sign_var.get()
+        auto_sign = bool(self.apk2aab_auto_sign.get())
         
-        if not input_path:
-            messagebox.showerror("错误", "请选择输入文件或文件夹")
-            return
-        
-        if not Path(input_path).exists():
-            messagebox.showerror("错误", f"路径不存在: {input_path}")
-            return
-        
-        if not output_dir:
-            messagebox.showerror("错误", "请指定输出目录")
+        if not self._validate_paths(self.apk2aab_error, input_path, output_dir):
             return
         
         # 禁用按钮
-        self.set_buttons_state("disabled")
-        self.set_status("正在转换...")
-        self.set_progress(0)
+        self.set_busy(True)
         
         def task():
             try:
-                converter = APKtoAABConverter(self.config)
+                converter = self._converter(APKtoAABConverter)
                 input_path_obj = Path(input_path)
                 
                 self.log(f"输出目录: {output_dir}")
@@ -1488,35 +1600,38 @@ class ConverterGUI:
                         self.log("❌ 转换失败")
                 else:
                     # 批量转换
-                    apk_files = list(input_path_obj.glob("*.apk"))
+                    apk_files = self._list_files(input_path_obj, {'.apk'})
                     total = len(apk_files)
                     
                     if total == 0:
                         self.log("❌ 未找到APK文件")
                         return
                     
-                    self.log(f"找到 {total} 个APK文件")
+                    self.log(f"找到 {total} 个APK文件，并行转换中...")
+                    out = Path(output_dir)
+                    apk_files = self._pending_files(apk_files, lambda f: out / f"{f.stem}.aab")
                     
-                    for i, apk_file in enumerate(apk_files, 1):
-                        self.log(f"[{i}/{total}] 转换: {apk_file.name}")
-                        self.set_progress(i / total)
-                        
-                        result = converter.convert(apk_file, auto_sign=auto_sign, output_dir=output_dir)
+                    # 各APK相互独立，在后台事件循环中并发转换
+                    self.begin_progress(len(apk_files))
+                    results = self._convert_apks(apk_files, lambda done, n: self.step_progress(),
+                                                 output_dir=output_dir, auto_sign=auto_sign)
+                    for apk_file in apk_files:
+                        if str(apk_file) not in results:
+                            continue  # 停止后未开始转换
+                        result = results[str(apk_file)]
                         if result:
-                            self.log(f"✅ 成功: {Path(result).name}")
+                            self.log(f"✅ 成功: {os.path.basename(result)}")
                         else:
                             self.log(f"❌ 失败: {apk_file.name}")
                     
-                    self.log(f"批量转换完成")
+                    self.log("⏹ 已停止" if self._cancel.is_set() else "批量转换完成")
                 
             except Exception as e:
                 self.log(f"❌ 错误: {str(e)}")
             finally:
-                self.root.after(0, lambda: self.set_buttons_state("normal"))
-                self.root.after(0, lambda: self.set_status("就绪"))
-                self.root.after(0, lambda: self.set_progress(1))
+                self._call_in_gui(self.set_busy, False)
         
-        threading.Thread(target=task, daemon=True).start()
+        self._pool.submit(task)
     
     def run_aab2apks(self):
         """运行 AAB → APKS 转换"""
@@ -1525,30 +1640,16 @@ class ConverterGUI:
         mode = self.aab2apks_mode.get() if hasattr(self.aab2apks_mode, 'get') else self.aab2apks_mode
         
         # 获取签名选项
-        if CTK_AVAILABLE:
-            auto_sign = self.aab2apks_auto_sign.get() == 1
-        else:
-            auto_sign = self.aab2apks_auto_sign_var.get()
+        auto_sign = bool(self.aab2apks_auto_sign.get())
         
-        if not input_path:
-            messagebox.showerror("错误", "请选择输入文件或文件夹")
-            return
-        
-        if not Path(input_path).exists():
-            messagebox.showerror("错误", f"路径不存在: {input_path}")
+        if not self._validate_paths(self.aab2apks_error, input_path, output_dir):
             return
         
-        if not output_dir:
-            messagebox.showerror("错误", "请指定输出目录")
-            return
-        
-        self.set_buttons_state("disabled")
-        self.set_status("正在转换...")
-        self.set_progress(0)
+        self.set_busy(True)
         
         def task():
             try:
-                converter = AABtoAPKSConverter(self.config)
+                converter = self._converter(AABtoAPKSConverter)
                 input_path_obj = Path(input_path)
                 
                 self.log(f"输出目录: {output_dir}")
@@ -1562,7 +1663,7 @@ class ConverterGUI:
                     else:
                         self.log("❌ 转换失败")
                 else:
-                    aab_files = list(input_path_obj.glob("*.aab"))
+                    aab_files = self._list_files(input_path_obj, {'.aab'})
                     total = len(aab_files)
                     
                     if total == 0:
@@ -1570,27 +1671,31 @@ class ConverterGUI:
                         return
                     
                     self.log(f"找到 {total} 个AAB文件")
+                    # 输出文件名规则与AABtoAPKSConverter.convert一致
+                    out = Path(output_dir)
+                    suffix = ".apks" if mode == "default" else f"_{mode}.apks"
+                    aab_files = self._pending_files(aab_files, lambda f: out / f"{f.stem}{suffix}")
+                    total = len(aab_files)
                     
-                    for i, aab_file in enumerate(aab_files, 1):
-                        self.log(f"[{i}/{total}] 转换: {aab_file.name}")
-                        self.set_progress(i / total)
-                        
-                        result = converter.convert(aab_file, mode=mode, output_dir=output_dir, auto_sign=auto_sign)
+                    def convert_one(aab_file):
+                        return converter.convert(aab_file, mode=mode, output_dir=output_dir, auto_sign=auto_sign)
+                    
+                    self.begin_progress(total)
+                    for i, (aab_file, result) in enumerate(self._convert_parallel(convert_one, aab_files), 1):
+                        self.step_progress()
                         if result:
-                            self.log(f"✅ 成功: {Path(result).name}")
+                            self.log(f"✅ [{i}/{total}] 成功: {os.path.basename(result)}")
                         else:
-                            self.log(f"❌ 失败: {aab_file.name}")
+                            self.log(f"❌ [{i}/{total}] 失败: {aab_file.name}")
                     
-                    self.log(f"批量转换完成")
+                    self.log("⏹ 已停止" if self._cancel.is_set() else "批量转换完成")
                 
             except Exception as e:
                 self.log(f"❌ 错误: {str(e)}")
             finally:
-                self.root.after(0, lambda: self.set_buttons_state("normal"))
-                self.root.after(0, lambda: self.set_status("就绪"))
-                self.root.after(0, lambda: self.set_progress(1))
+                self._call_in_gui(self.set_busy, False)
         
-        threading.Thread(target=task, daemon=True).start()
+        self._pool.submit(task)
     
     def run_full(self):
         """运行全流程转换"""
@@ -1599,31 +1704,17 @@ class ConverterGUI:
         mode = self.full_mode.get() if hasattr(self.full_mode, 'get') else self.full_mode
         
         # 获取签名选项
-        if CTK_AVAILABLE:
-            auto_sign = self.full_auto_sign.get() == 1
-        else:
-            auto_sign = self.full_auto_sign_var.get()
-        
-        if not input_path:
-            messagebox.showerror("错误", "请选择输入文件或文件夹")
-            return
-        
-        if not Path(input_path).exists():
-            messagebox.showerror("错误", f"路径不存在: {input_path}")
-            return
+        auto_sign = bool(self.full_auto_sign.get())
         
-        if not output_dir:
-            messagebox.showerror("错误", "请指定输出目录")
+        if not self._validate_paths(self.full_error, input_path, output_dir):
             return
         
-        self.set_buttons_state("disabled")
-        self.set_status("正在转换...")
-        self.set_progress(0)
+        self.set_busy(True)
         
         def task():
             try:
-                apk_converter = APKtoAABConverter(self.config)
-                apks_converter = AABtoAPKSConverter(self.config)
+                apk_converter = self._converter(APKtoAABConverter)
+                apks_converter = self._converter(AABtoAPKSConverter)
                 input_path_obj = Path(input_path)
                 
                 self.log(f"输出目录: {output_dir}")
@@ -1632,7 +1723,7 @@ class ConverterGUI:
                 if input_path_obj.is_file():
                     apk_files = [input_path_obj]
                 else:
-                    apk_files = list(input_path_obj.glob("*.apk"))
+                    apk_files = self._list_files(input_path_obj, {'.apk'})
                 
                 total = len(apk_files)
                 if total == 0:
@@ -1640,41 +1731,95 @@ class ConverterGUI:
                     return
                 
                 self.log(f"开始全流程转换 ({total} 个文件)")
+                self.log(f"APK → AAB → APKS ({mode})")
+                
+                # 两个步骤流水线执行：每个AAB生成后立即交给APKS线程池，与其余APK的转换同时进行
+                # AAB输出到默认目录（最终只需要APKS），APKS使用用户指定的输出目录；
+                # 已有且不比输入旧的AAB/APKS直接复用（APKS文件名规则与AABtoAPKSConverter.convert一致）
+                suffix = ".apks" if mode == "default" else f"_{mode}.apks"
+                output_path = Path(output_dir)
+                # 每个APK共两步（AAB、APKS），两个步骤的完成都计入进度
+                self.begin_progress(2 * total)
+                
+                def convert_aab(aab_file):
+                    # 停止后排队中的任务不再启动新的bundletool
+                    if self._cancel.is_set():
+                        return None
+                    expected_apks = output_path / f"{aab_file.stem}{suffix}"
+                    if _is_up_to_date(expected_apks, aab_file.stat().st_mtime_ns):
+                        self.log(f"  ✅ APKS已是最新: {expected_apks.name}")
+                        return str(expected_apks)
+                    # bundletool build-apks与步骤1的JVM共用名额
+                    with self._jvm_slots:
+                        if self._cancel.is_set():
+                            return None
+                        return apks_converter.convert(aab_file, mode=mode, output_dir=output_dir,
+                                                      auto_sign=auto_sign)
+                
+                apks_futures = {}
                 
-                for i, apk_file in enumerate(apk_files, 1):
-                    self.log(f"\n[{i}/{total}] 处理: {apk_file.name}")
-                    self.set_progress((i - 0.5) / total)
+                stage2 = ThreadPoolExecutor(max_workers=self.BATCH_WORKERS, thread_name_prefix="apks")
+                try:
+                    def aab_done(apk_file, aab_result):
+                        self.step_progress()
+                        if self._cancel.is_set():
+                            return
+                        if aab_result:
+                            aab_file = Path(aab_result)
+                            self.log(f"  ✅ AAB: {aab_file.name}")
+                            apks_futures[stage2.submit(convert_aab, aab_file)] = aab_file
+                        else:
+                            self.log(f"  ❌ AAB转换失败: {os.path.basename(apk_file)}")
+                            self.step_progress()
                     
-                    # APK → AAB (AAB输出到默认目录，最终只需要APKS)
-                    self.log("  步骤1: APK → AAB")
-                    aab_result = apk_converter.convert(apk_file, auto_sign=auto_sign)
+                    # 步骤1: APK → AAB
+                    pending_apks = []
+                    for apk_file in apk_files:
+                        expected_aab = self.config.aab_dir / f"{apk_file.stem}.aab"
+                        if _is_up_to_date(expected_aab, apk_file.stat().st_mtime_ns):
+                            aab_done(apk_file, str(expected_aab))
+                        else:
+                            pending_apks.append(apk_file)
+                    if len(pending_apks) < total:
+                        self.log(f"  跳过 {total - len(pending_apks)} 个已是最新的AAB")
                     
-                    if aab_result:
-                        self.log(f"  ✅ AAB: {Path(aab_result).name}")
-                        
-                        # AAB → APKS (使用用户指定的输出目录)
-                        self.log(f"  步骤2: AAB → APKS ({mode})")
-                        apks_result = apks_converter.convert(aab_result, mode=mode, output_dir=output_dir, auto_sign=auto_sign)
-                        
+                    if len(pending_apks) == 1:
+                        aab_done(pending_apks[0], apk_converter.convert(pending_apks[0], auto_sign=auto_sign))
+                    elif pending_apks:
+                        # 多个APK在后台事件循环中并发转换
+                        self._convert_apks(pending_apks, on_done=aab_done, auto_sign=auto_sign)
+                    
+                    # 步骤2: AAB → APKS（步骤1结束后不再有新任务提交）
+                    for future in as_completed(apks_futures):
+                        if self._cancel.is_set():
+                            # 停止后取消尚未开始的APKS转换（对已开始的任务无效）
+                            for pending in apks_futures:
+                                pending.cancel()
+                        if future.cancelled():
+                            continue
+                        aab_file = apks_futures[future]
+                        try:
+                            apks_result = future.result()
+                        except Exception as e:
+                            self.log(f"❌ 错误 {aab_file.name}: {e}")
+                            apks_result = None
+                        self.step_progress()
                         if apks_result:
-                            self.log(f"  ✅ APKS: {Path(apks_result).name}")
+                            self.log(f"  ✅ APKS: {os.path.basename(apks_result)}")
                         else:
-                            self.log("  ❌ APKS转换失败")
-                    else:
-                        self.log("  ❌ AAB转换失败")
-                    
-                    self.set_progress(i / total)
+                            self.log(f"  ❌ APKS转换失败: {aab_file.name}")
+                finally:
+                    # 正常结束时所有任务都已完成；出错或关闭窗口时不等待排队中的APKS转换
+                    _shutdown_now(stage2)
                 
-                self.log("\n🎉 全流程转换完成!")
+                self.log("\n⏹ 已停止" if self._cancel.is_set() else "\n🎉 全流程转换完成!")
                 
             except Exception as e:
                 self.log(f"❌ 错误: {str(e)}")
             finally:
-                self.root.after(0, lambda: self.set_buttons_state("normal"))
-                self.root.after(0, lambda: self.set_status("就绪"))
-                self.root.after(0, lambda: self.set_progress(1))
+                self._call_in_gui(self.set_busy, False)
         
-        threading.Thread(target=task, daemon=True).start()
+        self._pool.submit(task)
     
     def run_split2apk(self):
         """运行拆分包→APK转换"""
@@ -1682,30 +1827,16 @@ class ConverterGUI:
         output_dir = self.split2apk_output.get().strip()
         
         # 获取签名选项
-        if CTK_AVAILABLE:
-            auto_sign = self.split2apk_auto_sign.get() == 1
-        else:
-            auto_sign = self.split2apk_auto_sign_var.get()
-        
-        if not input_path:
-            messagebox.showerror("错误", "请选择输入文件或文件夹")
-            return
-        
-        if not Path(input_path).exists():
-            messagebox.showerror("错误", f"路径不存在: {input_path}")
-            return
+        auto_sign = bool(self.split2apk_auto_sign.get())
         
-        if not output_dir:
-            messagebox.showerror("错误", "请指定输出目录")
+        if not self._validate_paths(self.split2apk_error, input_path, output_dir):
             return
         
-        self.set_buttons_state("disabled")
-        self.set_status("正在转换...")
-        self.set_progress(0)
+        self.set_busy(True)
         
         def task():
             try:
-                converter = SplitAPKtoAPKConverter(self.config)
+                converter = self._converter(SplitAPKtoAPKConverter)
                 input_path_obj = Path(input_path)
                 
                 self.log(f"输出目录: {output_dir}")
@@ -1720,9 +1851,7 @@ class ConverterGUI:
                         self.log("❌ 转换失败")
                 else:
                     # 批量处理
-                    all_files = []
-                    for ext in ['.apks', '.xapk', '.apkm']:
-                        all_files.extend(input_path_obj.glob(f"*{ext}"))
+                    all_files = self._list_files(input_path_obj, SplitAPKtoAPKConverter.SUPPORTED_SUFFIXES)
                     
                     total = len(all_files)
                     if total == 0:
@@ -1730,27 +1859,29 @@ class ConverterGUI:
                         return
                     
                     self.log(f"找到 {total} 个文件")
+                    out = Path(output_dir)
+                    all_files = self._pending_files(all_files, lambda f: out / f"{f.stem}.apk")
+                    total = len(all_files)
                     
-                    for i, file_path in enumerate(all_files, 1):
-                        self.log(f"[{i}/{total}] 转换: {file_path.name}")
-                        self.set_progress(i / total)
-                        
-                        result = converter.convert(file_path, output_dir=output_dir, auto_sign=auto_sign)
+                    def convert_one(file_path):
+                        return converter.convert(file_path, output_dir=output_dir, auto_sign=auto_sign)
+                    
+                    self.begin_progress(total)
+                    for i, (file_path, result) in enumerate(self._convert_parallel(convert_one, all_files), 1):
+                        self.step_progress()
                         if result:
-                            self.log(f"✅ 成功: {Path(result).name}")
+                            self.log(f"✅ [{i}/{total}] 成功: {os.path.basename(result)}")
                         else:
-                            self.log(f"❌ 失败: {file_path.name}")
+                            self.log(f"❌ [{i}/{total}] 失败: {file_path.name}")
                     
-                    self.log(f"批量转换完成")
+                    self.log("⏹ 已停止" if self._cancel.is_set() else "批量转换完成")
                 
             except Exception as e:
                 self.log(f"❌ 错误: {str(e)}")
             finally:
-                self.root.after(0, lambda: self.set_buttons_state("normal"))
-                self.root.after(0, lambda: self.set_status("就绪"))
-                self.root.after(0, lambda: self.set_progress(1))
+                self._call_in_gui(self.set_busy, False)
         
-        threading.Thread(target=task, daemon=True).start()
+        self._pool.submit(task)
     
     def run(self):
         """运行主程序"""
@@ -1764,5 +1895,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # 批量转换使用进程池，打包为exe后子进程需要这一步
+    multiprocessing.freeze_support()
     main()
 
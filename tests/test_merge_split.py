@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""_copy_zip_entry_raw 的测试：原始复制后的zip可正常读取，STORED条目按zipalign规则对齐"""
+
+import io
+import os
+import struct
+import sys
+import unittest
+import zipfile
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import converter
+
+
+ENTRIES = [
+    # (源条目名, 目标条目名, 压缩方式, 数据)
+    ('lib/arm64-v8a/libfoo.so', 'lib/arm64-v8a/libfoo.so', zipfile.ZIP_STORED, b'\x7fELF' + b'\x01' * 5001),
+    ('res/raw/sound.ogg', 'res/raw/sound.ogg', zipfile.ZIP_STORED, b'OggS' + b'\x02' * 333),
+    ('res/layout/main.xml', 'res/layout/main.xml', zipfile.ZIP_DEFLATED, b'<xml/>' * 500),
+    ('classes.dex', 'classes3.dex', zipfile.ZIP_DEFLATED, b'dex\n035\0' + b'\x03' * 2000),
+]
+
+
+def _build_source():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        # 奇数长度的名字和数据，使后续条目的数据偏移不会碰巧对齐
+        zf.writestr('a.txt', b'x' * 7, compress_type=zipfile.ZIP_STORED)
+        for name, _, method, data in ENTRIES:
+            zf.writestr(name, data, compress_type=method)
+    buf.seek(0)
+    return buf
+
+
+def _data_offset(raw, info):
+    name_len, extra_len = struct.unpack('<HH', raw[info.header_offset + 26:info.header_offset + 30])
+    return info.header_offset + 30 + name_len + extra_len
+
+
+class CopyZipEntryRawTest(unittest.TestCase):
+
+    def _copy(self):
+        out = io.BytesIO()
+        with zipfile.ZipFile(_build_source()) as src, zipfile.ZipFile(out, 'w') as dst:
+            dst.writestr('AndroidManifest.xml', b'm' * 3)
+            buf = bytearray(64)
+            for name, arcname, _, _ in ENTRIES:
+                converter._copy_zip_entry_raw(src, src.getinfo(name), dst, arcname, buf)
+        return out.getvalue()
+
+    def _check_contents(self, raw):
+        with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.read('AndroidManifest.xml'), b'm' * 3)
+            for _, arcname, method, data in ENTRIES:
+                self.assertEqual(zf.read(arcname), data)
+                self.assertEqual(zf.getinfo(arcname).compress_type, method)
+            self.assertNotIn('classes.dex', zf.namelist())
+
+    def test_raw_copy_contents_and_alignment(self):
+        raw = self._copy()
+        self._check_contents(raw)
+        with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+            for _, arcname, method, _ in ENTRIES:
+                if method != zipfile.ZIP_STORED:
+                    continue
+                alignment = 4096 if arcname.endswith('.so') else 4
+                self.assertEqual(_data_offset(raw, zf.getinfo(arcname)) % alignment, 0, arcname)
+
+    def test_fallback_without_zipfile_internals(self):
+        with mock.patch.object(converter, '_zip_raw_copy_supported', return_value=False):
+            raw = self._copy()
+        self._check_contents(raw)
+
+
+if __name__ == '__main__':
+    unittest.main()